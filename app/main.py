@@ -74,9 +74,17 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
     await connect_db()
+    from app.services.v2.render_pipeline import prewarm_renderers
+    await prewarm_renderers()
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    from app.services.v2.browser_pool import close_browser
+    from app.services.v2.renderer_client import aclose_client
+    from app.services.v2.http_client import aclose_http_client
+    await close_browser()
+    await aclose_client()
+    await aclose_http_client()
     await disconnect_db()
 
 
@@ -189,6 +197,7 @@ async def health_check():
 async def health_check_detailed():
     """Detailed health check with service status"""
     from app.db import db
+    from app.services.v2.browser_pool import browser_status
     try:
         await db.execute_raw("SELECT 1")
         db_status = "healthy"
@@ -197,7 +206,8 @@ async def health_check_detailed():
 
     return {
         "status": "ok" if db_status == "healthy" else "degraded",
-        "services": {"database": db_status}
+        # Informational: the browser relaunches itself on the next render
+        "services": {"database": db_status, "render_browser": browser_status()}
     }
 
 
@@ -209,11 +209,10 @@ def _validate_image_url(url: str) -> None:
 async def _download_image(url: str) -> bytes:
     """Download image bytes from URL (validates against SSRF)."""
     _validate_image_url(url)
-    import httpx
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        return resp.content
+    from app.services.v2.http_client import get_http_client
+    resp = await get_http_client().get(url)
+    resp.raise_for_status()
+    return resp.content
 
 
 @router.post("/generate/v2")
@@ -12,6 +12,7 @@ POST /v2/templates/{id}/render → Render a template with given params
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -61,7 +62,7 @@ router = APIRouter(prefix="/v2", tags=["v2"])
 # In-memory stores for on-demand rendering
 _pack_params: dict[str, CreativeParameters] = {}  # pack_id → params
 _pack_scraped: dict[str, dict] = {}  # pack_id → scraped_data
-_render_cache: dict[str, tuple[bytes, float]] = {}  # render_id → (PNG bytes, timestamp)
+_render_cache: dict[str, tuple[bytes, float, str]] = {}  # render_id → (PNG bytes, timestamp, ETag)
 # competition_copy_store imported from render_pipeline
 
 # Unified flow: session cache for prepare → generate handoff
@@ -1002,23 +1003,34 @@ RENDER_TTL_SECONDS = 3600  # 1 hour
 def _cleanup_render_cache():
     """Evict expired render cache entries."""
     now = time.time()
-    expired = [k for k, (_, ts) in _render_cache.items() if now - ts > RENDER_TTL_SECONDS]
+    expired = [k for k, (_, ts, _) in _render_cache.items() if now - ts > RENDER_TTL_SECONDS]
     for k in expired:
         del _render_cache[k]
 
 
+def _etag_for(img_bytes: bytes) -> str:
+    """Strong ETag from image content; computed once when a render is cached."""
+    return f'"{hashlib.blake2b(img_bytes, digest_size=8).hexdigest()}"'
+
+
 @router.get("/renders/{render_id}.png")
-async def serve_render(render_id: str):
-    """Serve a cached rendered image."""
+async def serve_render(render_id: str, request: Request):
+    """Serve a cached rendered image.
+
+    Clients revalidating with If-None-Match get a 304 while the bytes are
+    unchanged. The ETag is derived from the image bytes, so a forced
+    re-render under the same id changes it whenever the new image differs.
+    """
     from fastapi.responses import Response
     entry = _render_cache.get(render_id)
     if not entry or (time.time() - entry[1]) > RENDER_TTL_SECONDS:
         raise HTTPException(status_code=404, detail="Render not found or expired")
-    return Response(
-        content=entry[0],
-        media_type="image/png",
-        headers={"Cache-Control": "max-age=3600"},
-    )
+    img_bytes, _, etag = entry
+    headers = {"Cache-Control": "max-age=3600", "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (t.strip().removeprefix("W/") for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=img_bytes, media_type="image/png", headers=headers)
 
 
 class RenderPackRequest(BaseModel):
@@ -1053,20 +1065,19 @@ async def render_pack(body: RenderPackRequest):
     if not static_templates:
         raise HTTPException(status_code=422, detail="No static templates to render")
 
-    renders: list[RenderPackItem] = []
+    scraped = _pack_scraped.get(body.pack_id, {})
 
-    for template in static_templates:
+    async def _render_one(template: AdTypeDefinition) -> RenderPackItem | None:
         cache_key = f"{body.pack_id}_{template.id}_1x1"
 
         cached = _render_cache.get(cache_key)
         if not body.force and cached and (time.time() - cached[1]) <= RENDER_TTL_SECONDS:
-            renders.append(RenderPackItem(
+            return RenderPackItem(
                 ad_type_id=template.id,
                 aspect_ratio="1:1",
                 image_url=f"/v2/renders/{cache_key}.png",
                 generation_time_ms=0,
-            ))
-            continue
+            )
 
         start = time.time()
         try:
@@ -1074,23 +1085,24 @@ async def render_pack(body: RenderPackRequest):
             if template.id == "review_static_competition":
                 copy = await generate_competition_copy(template, params)
 
-            scraped = _pack_scraped.get(body.pack_id, {})
             img_bytes = await dispatch_render(
-                template.id, params, dict(copy), scraped, None
+                template.id, params, dict(copy), scraped, None, force=body.force
             )
             gen_ms = int((time.time() - start) * 1000)
-            _render_cache[cache_key] = (img_bytes, time.time())
-            renders.append(RenderPackItem(
+            _render_cache[cache_key] = (img_bytes, time.time(), _etag_for(img_bytes))
+            return RenderPackItem(
                 ad_type_id=template.id,
                 aspect_ratio="1:1",
                 image_url=f"/v2/renders/{cache_key}.png",
                 generation_time_ms=gen_ms,
-            ))
+            )
         except Exception as e:
             logger.error(f"Pack render failed {template.id}: {e}")
-            continue
+            return None
 
-    return RenderPackResponse(renders=renders)
+    # Templates render concurrently; browser_pool caps open pages and captures
+    rendered = await asyncio.gather(*(_render_one(t) for t in static_templates))
+    return RenderPackResponse(renders=[r for r in rendered if r is not None])
 
 
 class RenderRequest(BaseModel):
@@ -1099,6 +1111,7 @@ class RenderRequest(BaseModel):
     ad_type_ids: list[str] | None = None  # None = render all selected
     aspect_ratios: list[str] | None = None  # None = use ad type defaults
     upload_to_s3: bool = False
+    force: bool = False  # bypass the render memo, re-render all
 
 
 class RenderResult(BaseModel):
@@ -1125,9 +1138,7 @@ async def render_static(body: RenderRequest):
     if not static_types:
         raise HTTPException(status_code=422, detail="No renderable static types selected")
 
-    results: list[RenderResult] = []
-
-    for template in static_types:
+    async def _render_one(template: AdTypeDefinition) -> RenderResult | None:
         start = time.time()
         try:
             copy = generate_copy_from_template(template, params)
@@ -1135,7 +1146,7 @@ async def render_static(body: RenderRequest):
                 copy = await generate_competition_copy(template, params)
 
             img_bytes = await dispatch_render(
-                template.id, params, dict(copy), {}, None
+                template.id, params, dict(copy), {}, None, force=body.force
             )
             gen_ms = int((time.time() - start) * 1000)
 
@@ -1143,18 +1154,19 @@ async def render_static(body: RenderRequest):
             if body.upload_to_s3:
                 asset_url = await upload_to_s3(img_bytes, template.id, "1:1")
 
-            results.append(RenderResult(
+            return RenderResult(
                 creative_id=str(uuid.uuid4())[:12],
                 ad_type_id=template.id,
                 aspect_ratio="1:1",
                 asset_url=asset_url,
                 generation_time_ms=gen_ms,
-            ))
+            )
         except Exception as e:
             logger.error(f"Render failed {template.id}: {e}")
-            continue
+            return None
 
-    return results
+    results = await asyncio.gather(*(_render_one(t) for t in static_types))
+    return [r for r in results if r is not None]
 
 
 # --- Template CRUD endpoints ---
@@ -1,4 +1,5 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from io import BytesIO
@@ -11,6 +12,17 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+
+# upload_fileobj switches to multipart above the threshold and sends parts in
+# parallel threads — matters for Remotion MP4s, which run 5-50 MB.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=8,
+    use_threads=True,
+)
+
 
 class S3Service:
     """AWS S3 service for image storage"""
@@ -67,7 +79,8 @@ class S3Service:
                 ExtraArgs={
                     "ContentType": content_type,
                     "CacheControl": "max-age=31536000",
-                }
+                },
+                Config=TRANSFER_CONFIG,
             )
 
             # Public URL (bucket must have public read policy)
@@ -161,7 +174,8 @@ class S3Service:
                 ExtraArgs={
                     "ContentType": content_type,
                     "CacheControl": "max-age=31536000",
-                }
+                },
+                Config=TRANSFER_CONFIG,
             )
 
             # Public URL
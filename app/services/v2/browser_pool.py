@@ -0,0 +1,309 @@
+"""
+Browser Pool — one shared headless Chromium for all social template renders.
+
+Each social template used to launch and tear down its own Chromium per render.
+This module keeps a single browser alive for the process and hands out
+short-lived pages. Pages open in a long-lived BrowserContext per
+viewport/scale: templates are static HTML with no cookies or storage, so
+there is nothing to isolate, and opening a page in an existing context is
+much cheaper than creating a context. A semaphore bounds how many pages are
+open at once, so a batch of creatives can render in parallel without
+oversubscribing CPU; a smaller one gates screenshots, which Chromium
+serializes internally and which slow down sharply when piled up. The
+browser is relaunched every BROWSER_RECYCLE_AFTER pages to shed the memory
+a long-lived Chromium accumulates.
+
+With PLAYWRIGHT_REMOTE_WS set, the pool connects to a remote Playwright
+browser server (e.g. a Browserless cluster) instead of launching Chromium
+in-process. That keeps the API container small, at the cost of a network
+hop per page operation; pooling, recycling and the semaphores work the same,
+with "recycling" dropping and reopening the connection.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+try:
+    # SIMD-accelerated decoder with the same API; 2x screenshots run to MBs
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Max pages rendering at once across all templates
+MAX_CONCURRENT_PAGES = int(os.environ.get("MAX_CONCURRENT_PAGES", "8"))
+# Max page.screenshot() calls in flight; pages beyond this keep loading
+# content and fonts while they wait for a capture slot
+MAX_CONCURRENT_SCREENSHOTS = int(os.environ.get("MAX_CONCURRENT_SCREENSHOTS", "4"))
+# Pixel density of rendered creatives: 2 gives 2160x2160 output for the
+# 1080x1080 layouts (approved creative spec); 1 renders and encodes a
+# quarter of the pixels, for deploys that only need native resolution
+DEVICE_SCALE_FACTOR = int(os.environ.get("RENDER_DEVICE_SCALE_FACTOR", "2"))
+# Relaunch Chromium after this many pages (0 disables recycling)
+BROWSER_RECYCLE_AFTER = int(os.environ.get("BROWSER_RECYCLE_AFTER", "100"))
+# ws:// endpoint of a remote Playwright browser server; unset launches
+# Chromium locally
+PLAYWRIGHT_REMOTE_WS = os.environ.get("PLAYWRIGHT_REMOTE_WS")
+
+# Same flags as the Node renderer's Puppeteer (renderer/src/renderer.ts).
+# Playwright already passes --no-sandbox; /dev/shm is 64 MB in Docker, so
+# Chromium must use /tmp for shared memory or large screenshots crash.
+# Playwright's defaults also cover --disable-extensions, --no-first-run,
+# --mute-audio, --hide-scrollbars and the background/renderer throttling
+# switches. Don't add a --disable-features here: Chromium keeps only the
+# last one, which would drop the feature list Playwright disables.
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--font-render-hinting=none",
+]
+
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_launch_lock: Optional[asyncio.Lock] = None
+_page_semaphore: Optional[asyncio.Semaphore] = None
+_screenshot_semaphore: Optional[asyncio.Semaphore] = None
+_pages_served = 0
+_active_pages = 0
+# Forces a layout so every font the page uses has started loading, then
+# resolves once they have all loaded
+_FONTS_READY_JS = (
+    "() => { document.body.offsetHeight; return document.fonts.ready.then(() => {}); }"
+)
+# Resolves once every <img> has loaded (or failed) and been decoded, so the
+# capture never catches a half-painted image
+_IMAGES_READY_JS = "() => Promise.all([...document.images].map(i => i.decode().catch(() => {})))"
+# (width, height, device_scale_factor) -> context on _contexts_browser
+_contexts: dict[tuple[int, int, int], BrowserContext] = {}
+_contexts_browser: Optional[Browser] = None
+
+
+def _bind_loop() -> None:
+    """(Re)create loop-bound state when first used on a new event loop.
+
+    Playwright objects belong to the loop that started them; scripts and tests
+    that call asyncio.run() repeatedly get a fresh browser per loop.
+    """
+    global _playwright, _browser, _loop, _launch_lock, _page_semaphore
+    global _screenshot_semaphore, _pages_served, _active_pages
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        _playwright = None
+        _browser = None
+        _pages_served = 0
+        _active_pages = 0
+        _loop = loop
+        _launch_lock = asyncio.Lock()
+        _page_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        _screenshot_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCREENSHOTS)
+
+
+async def get_browser() -> Browser:
+    """Return the shared Chromium, launching (or connecting to) it on first use."""
+    global _playwright, _browser
+    _bind_loop()
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    async with _launch_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            if PLAYWRIGHT_REMOTE_WS:
+                _browser = await _playwright.chromium.connect(PLAYWRIGHT_REMOTE_WS)
+                logger.info("Connected to remote Chromium")
+            else:
+                _browser = await _playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+                logger.info("Shared Chromium launched")
+    return _browser
+
+
+async def _get_context(
+    browser: Browser, width: int, height: int, device_scale_factor: int
+) -> BrowserContext:
+    """Return the shared context for this viewport, creating it on first use.
+
+    Contexts belong to one browser; the cache is dropped whenever the browser
+    changes (relaunch after a crash, recycling, a new event loop).
+    """
+    global _contexts_browser
+    if _contexts_browser is not browser:
+        _contexts.clear()
+        _contexts_browser = browser
+    key = (width, height, device_scale_factor)
+    context = _contexts.get(key)
+    if context is None:
+        async with _launch_lock:
+            context = _contexts.get(key)
+            if context is None:
+                context = await browser.new_context(
+                    viewport={"width": width, "height": height},
+                    device_scale_factor=device_scale_factor,
+                )
+                _contexts[key] = context
+    return context
+
+
+async def warm_up() -> None:
+    """Launch the browser and open the default render context ahead of the
+    first render (app startup)."""
+    browser = await get_browser()
+    await _get_context(browser, 1080, 1080, DEVICE_SCALE_FACTOR)
+
+
+def browser_status() -> str:
+    """Shared browser state for health checks.
+
+    "connected", "idle" (not launched yet, or recycled; the next render
+    launches it) or "disconnected" (crashed; the next render relaunches it).
+    """
+    if _browser is None:
+        return "idle"
+    return "connected" if _browser.is_connected() else "disconnected"
+
+
+@asynccontextmanager
+async def acquire_page(
+    width: int = 1080,
+    height: int = 1080,
+    device_scale_factor: int | None = None,
+) -> AsyncIterator[Page]:
+    """
+    Open a page on the shared browser, closing it on exit.
+
+    device_scale_factor defaults to DEVICE_SCALE_FACTOR.
+
+    Waits for a free slot when MAX_CONCURRENT_PAGES pages are already open.
+    """
+    global _pages_served, _active_pages
+    _bind_loop()
+    async with _page_semaphore:
+        browser = await get_browser()
+        _active_pages += 1
+        try:
+            context = await _get_context(
+                browser, width, height, device_scale_factor or DEVICE_SCALE_FACTOR
+            )
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+        finally:
+            _active_pages -= 1
+            _pages_served += 1
+        await _maybe_recycle()
+
+
+async def screenshot(page: Page, fmt: str = "png", quality: int | None = None) -> bytes:
+    """Capture the page's viewport as image bytes, waiting for a free capture
+    slot first.
+
+    fmt: "png", "jpeg" or "webp" (CDP encodes all three)
+    quality: 0-100 for jpeg/webp; ignored for png
+
+    Every template's viewport is exactly the output image, so this asks CDP
+    for the viewport directly instead of going through page.screenshot()'s
+    clip handling. optimizeForSpeed has Chromium encode with fast zlib
+    settings: PNGs come out somewhat larger but encode several times faster.
+    """
+    options = {
+        "format": fmt,
+        "captureBeyondViewport": False,
+        "fromSurface": True,
+        "optimizeForSpeed": True,
+    }
+    if quality is not None and fmt != "png":
+        options["quality"] = quality
+    async with _screenshot_semaphore:
+        cdp = await page.context.new_cdp_session(page)
+        try:
+            result = await cdp.send("Page.captureScreenshot", options)
+        finally:
+            await cdp.detach()
+    return base64.b64decode(result["data"])
+
+
+async def wait_for_fonts(page: Page, timeout: float = 3.0) -> None:
+    """Wait until the page's web fonts have loaded.
+
+    After timeout seconds the render goes ahead with fallback fonts rather
+    than failing (e.g. Google Fonts unreachable).
+    """
+    try:
+        await asyncio.wait_for(page.evaluate(_FONTS_READY_JS), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Web fonts not ready after {timeout}s, rendering with fallbacks")
+
+
+async def wait_for_images(page: Page, timeout: float = 10.0) -> None:
+    """Wait until every image on the page is loaded and decoded.
+
+    Replaces fixed sleeps after set_content: returns as soon as the images
+    are ready, and after timeout seconds renders whatever has painted.
+    """
+    try:
+        await asyncio.wait_for(page.evaluate(_IMAGES_READY_JS), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Images not ready after {timeout}s, rendering anyway")
+
+
+async def _maybe_recycle() -> None:
+    """Close the browser once it has served its quota and no page is open.
+
+    The next get_browser() call launches a fresh one. Pages still rendering
+    on the old browser are never interrupted: recycling waits for an idle
+    moment, which in a busy process just means a slightly later relaunch.
+    """
+    global _browser, _pages_served
+    if not BROWSER_RECYCLE_AFTER or _pages_served < BROWSER_RECYCLE_AFTER:
+        return
+    async with _launch_lock:
+        if _active_pages or _browser is None or _pages_served < BROWSER_RECYCLE_AFTER:
+            return
+        browser, _browser = _browser, None
+        _pages_served = 0
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing recycled Chromium: {e}")
+        logger.info(f"Shared Chromium recycled after {BROWSER_RECYCLE_AFTER} pages")
+
+
+async def close_browser() -> None:
+    """Close the shared browser and stop Playwright (app shutdown)."""
+    global _playwright, _browser
+    if _browser is not None:
+        try:
+            await _browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing shared Chromium: {e}")
+        _browser = None
+    if _playwright is not None:
+        try:
+            await _playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping Playwright: {e}")
+        _playwright = None
+
+
+async def closing(coro: Awaitable[T]) -> T:
+    """Await coro, then close the shared browser.
+
+    For scripts that render outside the app lifespan, which otherwise leave
+    Chromium running when asyncio.run() tears down the loop:
+    asyncio.run(closing(main())).
+    """
+    try:
+        return await coro
+    finally:
+        await close_browser()
@@ -0,0 +1,78 @@
+"""
+HTTP Client — shared pooled httpx client for outbound fetches (user image URLs).
+
+Keeps connections alive across requests instead of paying DNS + TLS setup on a
+fresh AsyncClient per download. Redirects are not followed: callers validate
+URLs against SSRF first, and a redirect would bypass that check.
+
+fetch_image() also keeps a small URL -> bytes cache for images that social
+templates embed, since the same scraped product photo appears in every
+creative of a pack.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Bound on cached image bytes (LRU by URL)
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_client: Optional[httpx.AsyncClient] = None
+_image_cache: OrderedDict[str, bytes] = OrderedDict()
+_image_cache_bytes = 0
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _client
+
+
+async def aclose_http_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_image(url: str) -> bytes | None:
+    """GET an http(s) image through the shared client, cached by URL.
+
+    Returns None for other schemes, non-image responses, redirects and
+    network errors; callers then fall back to letting the browser load the
+    URL itself.
+    """
+    global _image_cache_bytes
+    if not url.startswith(("http://", "https://")):
+        return None
+    data = _image_cache.get(url)
+    if data is not None:
+        _image_cache.move_to_end(url)
+        return data
+
+    try:
+        resp = await get_http_client().get(url)
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Image prefetch failed for {url}: {e}")
+        return None
+    if resp.status_code != 200 or not resp.headers.get("content-type", "").startswith("image/"):
+        return None
+
+    data = resp.content
+    _image_cache[url] = data
+    _image_cache_bytes += len(data)
+    while _image_cache_bytes > IMAGE_CACHE_MAX_BYTES and _image_cache:
+        _, old = _image_cache.popitem(last=False)
+        _image_cache_bytes -= len(old)
+    return data
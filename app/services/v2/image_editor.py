@@ -5,6 +5,7 @@ Takes a source image + text prompt, returns an edited image.
 Uses Gemini 2.0 Flash with image generation capabilities.
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -74,4 +75,6 @@ async def edit_image_from_file(
 
     import mimetypes
     mime = mimetypes.guess_type(str(path))[0] or "image/png"
-    return await edit_image(path.read_bytes(), prompt, mime)
+    # Read off the event loop — source photos can be several MB
+    image_bytes = await asyncio.to_thread(path.read_bytes)
+    return await edit_image(image_bytes, prompt, mime)
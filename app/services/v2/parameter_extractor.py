@@ -13,13 +13,15 @@ import os
 import json
 import asyncio
 import logging
-from urllib.parse import urlparse
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
 from google import genai
+from jsonschema import Draft202012Validator
 
 from app.schemas.creative_params import (
     CreativeParameters,
     BrandColors,
-    PersonaDemographics,
     TargetPersona,
 )
 
@@ -27,6 +29,7 @@ logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
 RETRY_DELAYS = [1, 2, 4]
+MAX_PROMPT_TEXT = 8000  # chars of page text sent to Gemini
 
 
 class ExtractionError(Exception):
@@ -135,6 +138,92 @@ RULES:
 - Always return valid JSON
 """
 
+# EXTRACTION_PROMPT split once into (literal, field) pairs so each call only
+# joins the pieces instead of re-parsing the whole template with str.format.
+_PROMPT_PARTS = tuple(
+    (literal, field) for literal, field, _, _ in Formatter().parse(EXTRACTION_PROMPT)
+)
+
+
+def _build_prompt(**fields) -> str:
+    """Fill EXTRACTION_PROMPT placeholders using the pre-parsed parts."""
+    return "".join(
+        literal + (str(fields[field]) if field is not None else "")
+        for literal, field in _PROMPT_PARTS
+    )
+
+
+_STR = {"type": "string"}
+_OPT_STR = {"type": ["string", "null"]}
+_STR_LIST = {"type": "array", "items": {"type": "string"}}
+# JSON Schema for the Gemini response. Compiled once at import and reused for
+# every attempt so malformed output is rejected (and retried) before merging.
+# Personas are optional and deliberately left out: _merge_params drops a
+# malformed one with a warning instead of failing the whole extraction.
+_LLM_SCHEMA = {
+    "type": "object",
+    "required": ["product_name", "customer_pains"],
+    "properties": {
+        "product_name": {"type": "string", "minLength": 2},
+        "business_type": {"enum": ["ecommerce", "saas", "service"]},
+        "product_category": _STR,
+        "product_description_short": _STR,
+        "price": _OPT_STR,
+        "currency": _OPT_STR,
+        "brand_name": _OPT_STR,
+        "key_benefit": _STR,
+        "key_differentiator": _STR,
+        "value_props": _STR_LIST,
+        "customer_pains": {"type": "array", "items": _STR, "minItems": 1},
+        "customer_desires": _STR_LIST,
+        "objections": _STR_LIST,
+        "tone": {"enum": ["premium", "casual", "clinical", "playful", "urgent"]},
+        "cta_text": _STR,
+        "social_proof": _OPT_STR,
+        "testimonials": _STR_LIST,
+        "urgency_hooks": _STR_LIST,
+        "scene_problem": _OPT_STR,
+        "scene_solution": _OPT_STR,
+        "scene_lifestyle": _OPT_STR,
+        "language": _OPT_STR,
+        "target_countries": _STR_LIST,
+        "competitors": {"type": "array", "items": {"type": "object"}},
+    },
+}
+_LLM_VALIDATOR = Draft202012Validator(_LLM_SCHEMA)
+
+
+@dataclass(frozen=True)
+class PreparedScrape:
+    """Scraped page reduced to what the LLM steps need, built once per page.
+
+    Every Gemini call for the same page should reuse ``prompt_text`` verbatim so
+    the shared prefix is eligible for Gemini's prompt caching.
+    """
+    prompt_text: str
+    background_colors: list[str]
+    text_colors: list[str]
+    accent_colors: list[str]
+    fonts: list[str]
+    og_image: str
+    html_lang: str
+    source_url: str
+
+
+def _prepare_scrape(scraped_data: dict, source_url: str | None) -> PreparedScrape:
+    """Truncate and normalise scraped data once for all LLM calls."""
+    styling = scraped_data.get("styling", {})
+    return PreparedScrape(
+        prompt_text=scraped_data.get("full_text", "")[:MAX_PROMPT_TEXT],
+        background_colors=styling.get("backgrounds", []),
+        text_colors=styling.get("text", []),
+        accent_colors=styling.get("accents", []),
+        fonts=styling.get("fonts", []),
+        og_image=scraped_data.get("og_image", ""),
+        html_lang=scraped_data.get("language") or "not set",
+        source_url=source_url or "unknown",
+    )
+
 
 async def extract_creative_parameters(
     scraped_data: dict,
@@ -160,7 +249,8 @@ async def extract_creative_parameters(
     direct_params = _extract_direct_params(scraped_data, source_url)
 
     # --- Step 2: Call Gemini for inferred fields ---
-    llm_params, review_analysis = await _extract_llm_params(scraped_data, api_key, source_url=source_url)
+    prepared = _prepare_scrape(scraped_data, source_url)
+    llm_params, review_analysis = await _extract_llm_params(prepared, api_key)
 
     # --- Step 3: Merge and build CreativeParameters ---
     params = _merge_params(direct_params, llm_params)
@@ -173,6 +263,14 @@ async def extract_creative_parameters(
     return params, review_analysis
 
 
+@lru_cache(maxsize=1024)
+def _brand_from_url(url: str) -> str:
+    """Brand name from the first host label: "https://www.cloudrest.com/x" -> "Cloudrest"."""
+    host = url.partition("://")[2].partition("/")[0]
+    host = host.removeprefix("www.")
+    return host.partition(".")[0].capitalize()
+
+
 def _extract_direct_params(scraped_data: dict, source_url: str | None) -> dict:
     """Extract parameters directly available from scraper output (no LLM needed)."""
     styling = scraped_data.get("styling", {})
@@ -185,13 +283,7 @@ def _extract_direct_params(scraped_data: dict, source_url: str | None) -> dict:
     secondary_color = accent_colors[0] if accent_colors else None
 
     # Brand name from domain if not extracted
-    brand_name = ""
-    if source_url:
-        parsed = urlparse(source_url)
-        # "cloudrest.com" -> "Cloudrest"
-        domain_parts = parsed.netloc.replace("www.", "").split(".")
-        if domain_parts:
-            brand_name = domain_parts[0].capitalize()
+    brand_name = _brand_from_url(source_url) if source_url else ""
 
     return {
         "source_url": source_url,
@@ -210,20 +302,19 @@ def _extract_direct_params(scraped_data: dict, source_url: str | None) -> dict:
     }
 
 
-async def _extract_llm_params(scraped_data: dict, api_key: str, source_url: str | None = None) -> tuple[dict, dict]:
+async def _extract_llm_params(prepared: PreparedScrape, api_key: str) -> tuple[dict, dict]:
     """Call Gemini to infer marketing parameters from scraped content."""
     client = genai.Client(api_key=api_key)
-    styling = scraped_data.get("styling", {})
 
-    prompt = EXTRACTION_PROMPT.format(
-        scraped_text=scraped_data.get("full_text", "")[:8000],
-        background_colors=styling.get("backgrounds", []),
-        text_colors=styling.get("text", []),
-        accent_colors=styling.get("accents", []),
-        fonts=styling.get("fonts", []),
-        og_image=scraped_data.get("og_image", ""),
-        html_lang=scraped_data.get("language") or "not set",
-        source_url=source_url or "unknown",
+    prompt = _build_prompt(
+        scraped_text=prepared.prompt_text,
+        background_colors=prepared.background_colors,
+        text_colors=prepared.text_colors,
+        accent_colors=prepared.accent_colors,
+        fonts=prepared.fonts,
+        og_image=prepared.og_image,
+        html_lang=prepared.html_lang,
+        source_url=prepared.source_url,
     )
 
     last_error = None
@@ -234,19 +325,22 @@ async def _extract_llm_params(scraped_data: dict, api_key: str, source_url: str
                 contents=prompt,
                 config={"response_mime_type": "application/json"},
             )
-            data = json.loads(result.text)
+            # Blocked/empty responses come back as None or whitespace; reject
+            # them without a parse attempt so the retry starts immediately.
+            text = result.text
+            if not text or text.isspace():
+                raise ValueError("Gemini returned an empty response")
+            data = json.loads(text)
 
             # Handle list response
             if isinstance(data, list) and len(data) > 0:
                 data = data[0]
-            if not isinstance(data, dict):
-                raise ValueError(f"Expected dict, got {type(data).__name__}")
 
-            # Validate minimum quality
-            if not data.get("product_name") or len(data.get("product_name", "")) < 2:
-                raise ValueError("product_name is missing or too short")
-            if not data.get("customer_pains") or len(data.get("customer_pains", [])) < 1:
-                raise ValueError("customer_pains is missing or empty")
+            # Validate structure and minimum quality
+            error = next(_LLM_VALIDATOR.iter_errors(data), None)
+            if error is not None:
+                field = ".".join(str(p) for p in error.path) or "response"
+                raise ValueError(f"{field}: {error.message}")
 
             # Pop review fields before returning core params
             review_analysis = {
@@ -269,6 +363,47 @@ async def _extract_llm_params(scraped_data: dict, api_key: str, source_url: str
     raise ExtractionError(f"LLM extraction failed after {MAX_RETRIES} attempts: {last_error}")
 
 
+# Fallbacks for LLM-inferred CreativeParameters fields, merged under the
+# Gemini output in one pass by _merge_params.
+_LLM_DEFAULTS = {
+    "product_name": "Product",
+    "business_type": "ecommerce",
+    "product_category": "General",
+    "product_description_short": "",
+    "price": None,
+    "currency": None,
+    "key_benefit": "",
+    "key_differentiator": "",
+    "value_props": [],
+    "customer_pains": [],
+    "customer_desires": [],
+    "objections": [],
+    "social_proof": None,
+    "testimonials": [],
+    "cta_text": "Shop Now",
+    "scene_problem": None,
+    "scene_solution": None,
+    "scene_lifestyle": None,
+    "tone": "casual",
+    "urgency_hooks": [],
+}
+_DEMOGRAPHICS_DEFAULTS = {"age_min": 18, "age_max": 65, "gender_skew": "neutral"}
+_PERSONA_PRIMARY_DEFAULTS = {"label": "General audience", "language_style": "Conversational"}
+_PERSONA_SECONDARY_DEFAULTS = {"label": "", "language_style": ""}
+
+
+def _parse_persona(p: dict, defaults: dict) -> TargetPersona:
+    """Build a TargetPersona from LLM output, filling missing or null fields
+    from defaults."""
+    p = {k: v for k, v in p.items() if v is not None}
+    demo = {k: v for k, v in (p.get("demographics") or {}).items() if v is not None}
+    return TargetPersona.model_validate({
+        **defaults,
+        **p,
+        "demographics": {**_DEMOGRAPHICS_DEFAULTS, **demo},
+    })
+
+
 def _merge_params(direct: dict, llm: dict) -> CreativeParameters:
     """Merge direct-extracted and LLM-inferred params into CreativeParameters."""
 
@@ -278,90 +413,42 @@ def _merge_params(direct: dict, llm: dict) -> CreativeParameters:
 
     if llm.get("persona_primary"):
         try:
-            p = llm["persona_primary"]
-            demo = p.get("demographics", {})
-            persona_primary = TargetPersona(
-                label=p.get("label", "General audience"),
-                demographics=PersonaDemographics(
-                    age_min=demo.get("age_min", 18),
-                    age_max=demo.get("age_max", 65),
-                    gender_skew=demo.get("gender_skew", "neutral"),
-                ),
-                psychographics=p.get("psychographics", []),
-                scenes=p.get("scenes", []),
-                language_style=p.get("language_style", "Conversational"),
-                specific_pains=p.get("specific_pains", []),
-                specific_desires=p.get("specific_desires", []),
-            )
+            persona_primary = _parse_persona(llm["persona_primary"], _PERSONA_PRIMARY_DEFAULTS)
         except Exception as e:
             logger.warning(f"Failed to parse primary persona: {e}")
 
     if llm.get("persona_secondary"):
         try:
-            p = llm["persona_secondary"]
-            if p.get("label"):
-                demo = p.get("demographics", {})
-                persona_secondary = TargetPersona(
-                    label=p.get("label", ""),
-                    demographics=PersonaDemographics(
-                        age_min=demo.get("age_min", 18),
-                        age_max=demo.get("age_max", 65),
-                        gender_skew=demo.get("gender_skew", "neutral"),
-                    ),
-                    psychographics=p.get("psychographics", []),
-                    scenes=p.get("scenes", []),
-                    language_style=p.get("language_style", ""),
-                    specific_pains=p.get("specific_pains", []),
-                    specific_desires=p.get("specific_desires", []),
+            if llm["persona_secondary"].get("label"):
+                persona_secondary = _parse_persona(
+                    llm["persona_secondary"], _PERSONA_SECONDARY_DEFAULTS
                 )
         except Exception as e:
             logger.warning(f"Failed to parse secondary persona: {e}")
 
     # Build final CreativeParameters — direct params override LLM where both exist
-    return CreativeParameters(
+    data = {
+        **_LLM_DEFAULTS,
+        **llm,
         # Source
-        source_url=direct.get("source_url"),
-        destination_url=direct.get("destination_url", ""),
-        # Product core (LLM)
-        product_name=llm.get("product_name", "Product"),
-        business_type=llm.get("business_type", "ecommerce") if llm.get("business_type") in ("ecommerce", "saas", "service") else "ecommerce",
-        product_category=llm.get("product_category", "General"),
-        product_description_short=llm.get("product_description_short", ""),
-        price=llm.get("price"),
-        currency=llm.get("currency"),
-        # Brand identity (direct)
-        brand_name=llm.get("brand_name") or direct.get("brand_name", ""),
-        brand_colors=direct.get("brand_colors", BrandColors()),
-        brand_fonts=direct.get("brand_fonts", ["Inter"]),
-        brand_logo_url=direct.get("brand_logo_url"),
+        "source_url": direct.get("source_url"),
+        "destination_url": direct.get("destination_url", ""),
+        # Brand identity (direct, LLM brand name preferred)
+        "brand_name": llm.get("brand_name") or direct.get("brand_name", ""),
+        "brand_colors": direct.get("brand_colors", BrandColors()),
+        "brand_fonts": direct.get("brand_fonts", ["Inter"]),
+        "brand_logo_url": direct.get("brand_logo_url"),
         # Images (direct)
-        hero_image_url=direct.get("hero_image_url"),
+        "hero_image_url": direct.get("hero_image_url"),
         # Headlines (direct with LLM fallback)
-        headline=direct.get("headline") or llm.get("product_name", ""),
-        subheadline=direct.get("subheadline"),
-        # Messaging (LLM)
-        key_benefit=llm.get("key_benefit", ""),
-        key_differentiator=llm.get("key_differentiator", ""),
-        value_props=llm.get("value_props", []),
-        customer_pains=llm.get("customer_pains", []),
-        customer_desires=llm.get("customer_desires", []),
-        objections=llm.get("objections", []),
-        # Social proof (LLM)
-        social_proof=llm.get("social_proof"),
-        testimonials=llm.get("testimonials", []),
-        # CTA (LLM with fallback)
-        cta_text=llm.get("cta_text", "Shop Now"),
-        # Personas (LLM, parsed above)
-        persona_primary=persona_primary,
-        persona_secondary=persona_secondary,
-        # Scenes (LLM)
-        scene_problem=llm.get("scene_problem"),
-        scene_solution=llm.get("scene_solution"),
-        scene_lifestyle=llm.get("scene_lifestyle"),
-        # Tone (LLM)
-        tone=llm.get("tone", "casual"),
-        urgency_hooks=llm.get("urgency_hooks", []),
+        "headline": direct.get("headline") or llm.get("product_name", ""),
+        "subheadline": direct.get("subheadline"),
+        # Personas (parsed above)
+        "persona_primary": persona_primary,
+        "persona_secondary": persona_secondary,
         # Language & Geo (LLM with scraper hint)
-        language=llm.get("language") or direct.get("html_lang") or "en",
-        target_countries=llm.get("target_countries") if isinstance(llm.get("target_countries"), list) and llm.get("target_countries") else ["US"],
-    )
+        "language": llm.get("language") or direct.get("html_lang") or "en",
+        "target_countries": llm.get("target_countries") or ["US"],
+    }
+
+    return CreativeParameters.model_validate(data)
@@ -3,23 +3,37 @@ Remotion Renderer — async HTTP client for video rendering via the renderer mic
 
 Calls POST /render/video on the Node.js renderer, which bundles and renders
 Remotion compositions server-side. Returns MP4 bytes.
+
+The renderer is a long-lived process that bundles the Remotion project once
+at startup, so there is no per-render Node boot or TypeScript transpile.
+Video rendering always goes through it — there is no local subprocess path.
 """
 
-import base64
+import asyncio
 import logging
 import os
 from typing import Optional
 
 import httpx
 
+try:
+    # SIMD-accelerated decoder with the same API; MP4 payloads are several MB
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 logger = logging.getLogger(__name__)
 
 # Config from env (same vars as renderer_client.py)
 RENDERER_URL = os.environ.get("RENDERER_URL", "http://localhost:3100")
 RENDERER_API_KEY = os.environ.get("RENDERER_API_KEY", "")
 RENDER_TIMEOUT = 120.0  # seconds — video renders are slower than image renders
+# Cap on in-flight video renders from this process, so a large batch queues
+# here instead of oversubscribing the renderer's ffmpeg/Chromium workers.
+MAX_CONCURRENT_RENDERS = int(os.environ.get("MAX_CONCURRENT_RENDERS", "4"))
 
 _client: Optional[httpx.AsyncClient] = None
+_render_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RENDERS)
 
 
 class RemotionRenderError(Exception):
@@ -62,15 +76,19 @@ async def render_remotion_video(
     logger.info(f"Requesting video render: '{composition_id}'")
 
     try:
-        resp = await client.post(
-            "/render/video",
-            json={
-                "composition_id": composition_id,
-                "input_props": props,
-            },
-        )
+        # httpx's timeout is per network operation; bound the whole request
+        # so a slowly trickling response can't hold the caller indefinitely.
+        # The deadline starts once a render slot is free, not while queued.
+        async with _render_semaphore, asyncio.timeout(RENDER_TIMEOUT):
+            resp = await client.post(
+                "/render/video",
+                json={
+                    "composition_id": composition_id,
+                    "input_props": props,
+                },
+            )
         resp.raise_for_status()
-    except httpx.TimeoutException:
+    except (httpx.TimeoutException, TimeoutError):
         raise RemotionRenderError(
             f"Video render timed out after {RENDER_TIMEOUT}s "
             f"for composition '{composition_id}'"
@@ -6,11 +6,20 @@ Extracts: dispatch_render, render_static_creatives, upload helpers, build_target
 """
 
 import asyncio
+import dataclasses
+import hashlib
+import importlib
+import io
 import logging
 import random
+import secrets
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+import orjson
 
 from app.schemas.creative_params import CreativeParameters
 from app.schemas.ad_types import AdTypeDefinition
@@ -26,12 +35,176 @@ from app.services.v2.social_template_bridges import (
     bridge_branded_static_video,
     bridge_service_hero_video,
 )
+from app.services.v2.social_templates.branded_static import render_branded_static
+from app.services.v2.social_templates.problem_statement import render_problem_statement
+from app.services.v2.social_templates.product_centric import render_product_centric
+from app.services.v2.social_templates.reddit_post import render_reddit_post
+from app.services.v2.social_templates.review_static import render_review_static
+from app.services.v2.social_templates.service_hero import render_service_hero
 
 logger = logging.getLogger(__name__)
 
 # Competition copy store — shared between router and pipeline
 competition_copy_store: dict[str, dict] = {}
 
+# boto3 is blocking, so uploads run in worker threads (overlapping with other
+# creatives' renders); cap how many PUTs are in flight at once.
+MAX_CONCURRENT_UPLOADS = 8
+_upload_semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+
+_SOCIAL_TEMPLATES_PKG = "app.services.v2.social_templates"
+
+# Brand colors too close to the blog card's white background to use as accent
+_NEUTRAL_BG = frozenset({"#ffffff", "#f7f7f7", "#fafafa"})
+
+# Playwright-rendered ad types:
+# ad_type_id -> (render function, bridge(params, copy, scraped_data, rng))
+# rng is seeded from the render key, so the mock usernames and counts some
+# bridges draw are fixed per set of inputs and a memoized render matches a
+# fresh one
+_STATIC_RENDERERS: dict[
+    str,
+    tuple[
+        Callable[..., Awaitable[bytes]],
+        Callable[[CreativeParameters, dict, dict, random.Random], Any],
+    ],
+] = {
+    "branded_static": (
+        render_branded_static, lambda p, c, s, r: bridge_branded_static(p, s, c),
+    ),
+    "organic_static_reddit": (
+        render_reddit_post, lambda p, c, s, r: bridge_reddit(p, c, r),
+    ),
+    "problem_statement_text": (
+        render_problem_statement, lambda p, c, s, r: bridge_problem_statement(p, c),
+    ),
+    "review_static": (
+        render_review_static, lambda p, c, s, r: bridge_review_static(p, c, r),
+    ),
+    "service_hero": (
+        render_service_hero, lambda p, c, s, r: bridge_service_hero(p, c),
+    ),
+    "product_centric": (
+        render_product_centric, lambda p, c, s, r: bridge_product_centric(p, s, c),
+    ),
+}
+
+# Remotion-rendered ad types: ad_type_id -> (composition id, bridge(params, copy, scraped_data))
+_VIDEO_RENDERERS: dict[str, tuple[str, Callable[[CreativeParameters, dict, dict], dict]]] = {
+    "branded_static_video": (
+        "BrandedStatic", lambda p, c, s: bridge_branded_static_video(p, s, c),
+    ),
+    "service_hero_video": (
+        "ServiceHero", lambda p, c, s: bridge_service_hero_video(p, c),
+    ),
+}
+
+
+# Memoized renders of the deterministic (table-driven) ad types, keyed by a
+# hash of everything the render depends on. Duplicate creatives in a batch,
+# and re-renders of an unchanged pack, reuse the bytes instead of driving
+# Chromium again. Bounded by total bytes since videos run to tens of MB.
+RENDER_MEMO_TTL_SECONDS = 600
+RENDER_MEMO_MAX_BYTES = 256 * 1024 * 1024
+
+_render_memo: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+_render_memo_bytes = 0
+# Renders in progress, so concurrent identical requests share one render
+_render_inflight: dict[str, asyncio.Future[bytes]] = {}
+
+
+def _render_key(
+    ad_type_id: str,
+    params: CreativeParameters,
+    copy: dict,
+    scraped_data: dict,
+) -> str:
+    payload = orjson.dumps(
+        [ad_type_id, params.model_dump(mode="json"), copy, scraped_data],
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _template_key(template: str, template_params: Any) -> str:
+    """Memo key for a render driven directly by a social template params
+    dataclass (orjson serializes dataclasses field by field)."""
+    payload = orjson.dumps([template, template_params], default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _store_render(key: str, task: asyncio.Future[bytes]) -> None:
+    global _render_memo_bytes
+    # A forced render replaces the in-flight entry; a render it superseded
+    # must not overwrite the fresher result
+    if _render_inflight.get(key) is not task:
+        return
+    del _render_inflight[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    data = task.result()
+    old = _render_memo.pop(key, None)
+    if old is not None:
+        _render_memo_bytes -= len(old[0])
+    _render_memo[key] = (data, time.time())
+    _render_memo_bytes += len(data)
+    while _render_memo_bytes > RENDER_MEMO_MAX_BYTES and _render_memo:
+        _, (old, _) = _render_memo.popitem(last=False)
+        _render_memo_bytes -= len(old)
+
+
+async def _memoized_render(
+    key: str,
+    render: Callable[[], Awaitable[bytes]],
+    force: bool = False,
+) -> bytes:
+    """Return cached bytes for key, join an identical render in flight, or
+    start a new one. Failures are not cached.
+
+    force: always start a new render; its result replaces the memo entry.
+    """
+    global _render_memo_bytes
+    hit = None if force else _render_memo.get(key)
+    if hit is not None:
+        data, ts = hit
+        if time.time() - ts < RENDER_MEMO_TTL_SECONDS:
+            _render_memo.move_to_end(key)
+            return data
+        del _render_memo[key]
+        _render_memo_bytes -= len(data)
+
+    task = None if force else _render_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(render())
+        _render_inflight[key] = task
+        task.add_done_callback(lambda t: _store_render(key, t))
+    # shield: one caller being cancelled must not cancel the shared render
+    return await asyncio.shield(task)
+
+
+async def prewarm_renderers() -> None:
+    """Import the renderers dispatch_render loads lazily (competition blog,
+    Remotion client), launch the shared Chromium and open its default render
+    context, so the first render request doesn't pay for any of it (app
+    startup). The other template modules load with this module and its
+    bridges.
+
+    The Remotion bundle is built by the renderer service at its own startup.
+    """
+    from app.services.v2.browser_pool import warm_up
+
+    start = time.time()
+    importlib.import_module(f"{_SOCIAL_TEMPLATES_PKG}.blog_review")
+    importlib.import_module("app.services.v2.remotion_renderer")
+    try:
+        await warm_up()
+    except Exception as e:
+        logger.warning(f"Chromium prewarm failed, will launch on first render: {e}")
+        return
+    logger.info(f"Renderers prewarmed in {int((time.time() - start) * 1000)}ms")
+
 
 async def dispatch_render(
     ad_type_id: str,
@@ -39,35 +212,44 @@ async def dispatch_render(
     copy: dict,
     scraped_data: dict,
     creative_id: str | None = None,
+    batch_date: str | None = None,
+    force: bool = False,
 ) -> bytes:
-    """Dispatch rendering to the correct social template renderer."""
-    if ad_type_id == "branded_static":
-        from app.services.v2.social_templates.branded_static import render_branded_static
-        return await render_branded_static(bridge_branded_static(params, scraped_data, copy))
-
-    if ad_type_id == "organic_static_reddit":
-        from app.services.v2.social_templates.reddit_post import render_reddit_post
-        return await render_reddit_post(bridge_reddit(params, copy))
-
-    if ad_type_id == "problem_statement_text":
-        from app.services.v2.social_templates.problem_statement import render_problem_statement
-        return await render_problem_statement(bridge_problem_statement(params, copy))
+    """Dispatch rendering to the correct social template renderer.
+
+    Table-driven ad types are memoized on their inputs (see _memoized_render),
+    and their mock reddit/review values are seeded from the same key;
+    competition blog cards are memoized on their final template params.
+    Person-centric renders are not, since each one embeds a freshly
+    generated image.
+
+    batch_date: "Mon YYYY" shown on competition blog cards; pass one value
+    for a whole batch, otherwise it is computed per call.
+    force: bypass the render memo and re-render (e.g. a forced pack render).
+    """
+    static = _STATIC_RENDERERS.get(ad_type_id)
+    if static is not None:
+        render_fn, bridge = static
+        key = _render_key(ad_type_id, params, copy, scraped_data)
+        return await _memoized_render(
+            key,
+            lambda: render_fn(bridge(params, copy, scraped_data, random.Random(key))),
+            force,
+        )
 
-    if ad_type_id == "review_static":
-        from app.services.v2.social_templates.review_static import render_review_static
-        return await render_review_static(bridge_review_static(params, copy))
+    video = _VIDEO_RENDERERS.get(ad_type_id)
+    if video is not None:
+        from app.services.v2.remotion_renderer import render_remotion_video
+        composition_id, bridge = video
+        return await _memoized_render(
+            _render_key(ad_type_id, params, copy, scraped_data),
+            lambda: render_remotion_video(composition_id, bridge(params, copy, scraped_data)),
+            force,
+        )
 
     if ad_type_id == "review_static_competition":
         comp_copy = competition_copy_store.get(creative_id, {}) if creative_id else {}
-        return await render_competition_blog(params, comp_copy)
-
-    if ad_type_id == "service_hero":
-        from app.services.v2.social_templates.service_hero import render_service_hero
-        return await render_service_hero(bridge_service_hero(params, copy))
-
-    if ad_type_id == "product_centric":
-        from app.services.v2.social_templates.product_centric import render_product_centric
-        return await render_product_centric(bridge_product_centric(params, scraped_data, copy))
+        return await render_competition_blog(params, comp_copy, creative_id, batch_date, force)
 
     if ad_type_id == "person_centric":
         from app.services.v2.social_templates.person_centric import (
@@ -75,19 +257,9 @@ async def dispatch_render(
         )
         bridged = bridge_person_centric(params, copy)
         person_bytes = await generate_person_image(params)
-        bridged.person_image_bytes = person_bytes
-        return await render_person_centric(bridged)
-
-    # Video types (Remotion-rendered)
-    if ad_type_id == "branded_static_video":
-        from app.services.v2.remotion_renderer import render_remotion_video
-        props = bridge_branded_static_video(params, scraped_data, copy)
-        return await render_remotion_video("BrandedStatic", props)
-
-    if ad_type_id == "service_hero_video":
-        from app.services.v2.remotion_renderer import render_remotion_video
-        props = bridge_service_hero_video(params, copy)
-        return await render_remotion_video("ServiceHero", props)
+        return await render_person_centric(
+            dataclasses.replace(bridged, person_image_bytes=person_bytes)
+        )
 
     raise ValueError(f"Unknown ad type for rendering: {ad_type_id}")
 
@@ -95,8 +267,15 @@ async def dispatch_render(
 async def render_competition_blog(
     params: CreativeParameters,
     comp_copy: dict,
+    creative_id: str | None = None,
+    batch_date: str | None = None,
+    force: bool = False,
 ) -> bytes:
-    """Render competition creative as blog review card via Playwright."""
+    """Render competition creative as blog review card via Playwright.
+
+    The clap count is seeded from creative_id, so re-renders of the same
+    creative show the same number.
+    """
     from app.services.v2.social_templates.blog_review import BlogReviewParams, render_blog_review
 
     product_name = params.product_name or "this product"
@@ -114,10 +293,10 @@ async def render_competition_blog(
         body = product_name
 
     accent = "#3B82F6"
-    if params.brand_colors:
-        bc = params.brand_colors
-        for c in [bc.secondary, bc.accent, bc.primary]:
-            if c and c.startswith("#") and c.lower() not in ("#ffffff", "#f7f7f7", "#fafafa"):
+    bc = params.brand_colors
+    if bc:
+        for c in (bc.secondary, bc.accent, bc.primary):
+            if c and c[0] == "#" and c.lower() not in _NEUTRAL_BG:
                 accent = c
                 break
 
@@ -129,12 +308,16 @@ async def render_competition_blog(
         blog_title=blog_title,
         body=body,
         read_time="3 min",
-        date=datetime.now().strftime("%b %Y"),
+        date=batch_date or datetime.now().strftime("%b %Y"),
         accent_color=accent,
-        claps=random.randint(150, 400),
+        claps=random.Random(creative_id).randint(150, 400),
     )
 
-    return await render_blog_review(blog_params)
+    return await _memoized_render(
+        _template_key("blog_review", blog_params),
+        lambda: render_blog_review(blog_params),
+        force,
+    )
 
 
 async def render_static_creatives(
@@ -144,6 +327,7 @@ async def render_static_creatives(
     scraped_data: dict | None = None,
 ) -> list[GeneratedCreative]:
     """Render statics (Playwright) and videos (Remotion) for all creatives."""
+    batch_date = datetime.now().strftime("%b %Y")
 
     async def _render_one(creative: GeneratedCreative) -> None:
         if creative.format not in ("static", "video"):
@@ -158,7 +342,8 @@ async def render_static_creatives(
                 "cta_type": creative.cta_type or "LEARN_MORE",
             }
             rendered_bytes = await dispatch_render(
-                creative.ad_type_id, params, copy, scraped_data or {}, creative.id
+                creative.ad_type_id, params, copy, scraped_data or {}, creative.id,
+                batch_date=batch_date,
             )
             creative.generation_time_ms = int((time.time() - start) * 1000)
 
@@ -178,17 +363,25 @@ async def render_static_creatives(
         except Exception as e:
             logger.error(f"Render failed {creative.ad_type_id}: {e}", exc_info=True)
 
-    # Render statics sequentially (shared Playwright browser), videos in parallel
-    static_creatives = [c for c in creatives if c.format == "static"]
-    video_creatives = [c for c in creatives if c.format == "video"]
+    # Render everything in parallel. Statics share one Chromium whose page
+    # count is capped by browser_pool; videos are capped by remotion_renderer.
+    # _render_one logs its own failures, so one bad creative never cancels
+    # its siblings; the group just guarantees all tasks are awaited.
+    async with asyncio.TaskGroup() as tg:
+        for c in creatives:
+            if c.format in ("static", "video"):
+                tg.create_task(_render_one(c))
 
-    for c in static_creatives:
-        await _render_one(c)
+    return creatives
 
-    if video_creatives:
-        await asyncio.gather(*[_render_one(c) for c in video_creatives])
 
-    return creatives
+_RATIO_SLUG = {"1:1": "1x1", "9:16": "9x16", "1.91:1": "1_91x1"}
+
+
+def _make_key(ad_type_id: str, aspect_ratio: str, ext: str) -> str:
+    """S3 filename for a rendered creative, e.g. v2/review_static_1x1_3f9a0c1e.png"""
+    ratio_slug = _RATIO_SLUG.get(aspect_ratio) or aspect_ratio.replace(":", "x").replace(".", "_")
+    return f"v2/{ad_type_id}_{ratio_slug}_{secrets.token_hex(4)}.{ext}"
 
 
 async def upload_to_s3(
@@ -198,9 +391,11 @@ async def upload_to_s3(
     try:
         from app.services.s3 import get_s3_service
         s3 = get_s3_service()
-        ratio_slug = aspect_ratio.replace(":", "x").replace(".", "_")
-        filename = f"v2/{ad_type_id}_{ratio_slug}_{uuid.uuid4().hex[:8]}.png"
-        result = s3.upload_image(img_bytes, "v2-renders", filename)
+        filename = _make_key(ad_type_id, aspect_ratio, "png")
+        async with _upload_semaphore:
+            result = await asyncio.to_thread(
+                s3.upload_image, img_bytes, "v2-renders", filename
+            )
         if result.get("success"):
             return result["url"]
     except Exception as e:
@@ -215,11 +410,12 @@ async def upload_video_to_s3(
     try:
         from app.services.s3 import get_s3_service
         s3 = get_s3_service()
-        ratio_slug = aspect_ratio.replace(":", "x").replace(".", "_")
-        filename = f"v2/{ad_type_id}_{ratio_slug}_{uuid.uuid4().hex[:8]}.mp4"
-        result = s3.upload_image(
-            video_bytes, "v2-renders", filename, content_type="video/mp4"
-        )
+        filename = _make_key(ad_type_id, aspect_ratio, "mp4")
+        async with _upload_semaphore:
+            result = await asyncio.to_thread(
+                s3.upload_image,
+                video_bytes, "v2-renders", filename, content_type="video/mp4",
+            )
         if result.get("success"):
             return result["url"]
     except Exception as e:
@@ -227,6 +423,10 @@ async def upload_video_to_s3(
     return None
 
 
+# Persona gender_skew -> Meta targeting genders ([1]=male, [2]=female, None=all)
+_GENDER_MAP: dict[str, list[int] | None] = {"neutral": None, "male": [1], "female": [2]}
+
+
 def build_targeting(params: CreativeParameters) -> TargetingSpec:
     """Derive targeting spec from persona analysis (Smart Broad strategy)."""
     persona = params.persona_primary
@@ -240,13 +440,13 @@ def build_targeting(params: CreativeParameters) -> TargetingSpec:
             f"based on {persona.label}. "
             f"Using Advantage+ broad targeting to let Meta's algorithm optimize."
         )
+        if demo.gender_skew not in _GENDER_MAP:
+            logger.warning(f"Unknown gender_skew {demo.gender_skew!r}, targeting all genders")
         return TargetingSpec(
             geo_locations=geo,
             age_min=demo.age_min,
             age_max=demo.age_max,
-            genders=None if demo.gender_skew == "neutral" else (
-                [1] if demo.gender_skew == "male" else [2]
-            ),
+            genders=_GENDER_MAP.get(demo.gender_skew),
             targeting_rationale=rationale,
         )
 
@@ -256,6 +456,22 @@ def build_targeting(params: CreativeParameters) -> TargetingSpec:
     )
 
 
+# Uploaded images at least this large and already square are used as the
+# creative directly — the showcase render would only re-frame them at 1:1.
+SHOWCASE_MIN_SIDE = 1024
+
+
+def _image_size(image_bytes: bytes) -> tuple[int, int]:
+    """(width, height) from the image header, without decoding pixels."""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            return img.size
+    except Exception:
+        return (0, 0)
+
+
 async def add_manual_image_creative(
     creatives: list[GeneratedCreative],
     image_url: str,
@@ -264,38 +480,41 @@ async def add_manual_image_creative(
 ) -> None:
     """Add manual_image_upload creative (#9) with optional Gemini edit."""
     try:
-        import httpx
         from app.services.s3 import get_s3_service
+        from app.services.v2.http_client import get_http_client
         from app.routers.quick import _validate_image_url
 
         _validate_image_url(image_url)
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(image_url)
-            resp.raise_for_status()
-            image_bytes = resp.content
+        resp = await get_http_client().get(image_url)
+        resp.raise_for_status()
+        image_bytes = resp.content
 
         if edit_prompt:
             from app.services.v2.image_editor import edit_image
             logger.info(f"Editing user image with prompt: {edit_prompt[:80]}")
             image_bytes = await edit_image(image_bytes, edit_prompt)
 
-        from app.services.v2.social_templates.product_showcase import (
-            render_product_showcase, ProductShowcaseParams,
-        )
-
-        s3 = get_s3_service()
+        w, h = _image_size(image_bytes) if not edit_prompt else (0, 0)
+        if w == h and w >= SHOWCASE_MIN_SIDE:
+            logger.info(f"Manual image is already {w}x{h}, skipping showcase render")
+            asset_url = image_url
+        else:
+            from app.services.v2.social_templates.product_showcase import (
+                render_product_showcase, ProductShowcaseParams,
+            )
 
-        temp_id = f"v2_manual_{uuid.uuid4().hex[:8]}"
-        temp_result = s3.upload_image(image_bytes, temp_id)
-        showcase_url = temp_result["url"] if temp_result.get("success") else image_url
+            s3 = get_s3_service()
 
-        showcase_bytes = await render_product_showcase(
-            ProductShowcaseParams(product_image_url=showcase_url)
-        )
+            # The (possibly edited) image goes into the page inline, so the render
+            # doesn't wait on a temp S3 upload just to get a URL for it.
+            showcase_bytes = await render_product_showcase(
+                ProductShowcaseParams(product_image_url=image_url, product_image_bytes=image_bytes)
+            )
 
-        render_id = f"v2_manual_showcase_{uuid.uuid4().hex[:8]}"
-        render_result = s3.upload_image(showcase_bytes, render_id)
-        asset_url = render_result["url"] if render_result.get("success") else None
+            render_id = f"v2_manual_showcase_{secrets.token_hex(4)}"
+            async with _upload_semaphore:
+                render_result = await asyncio.to_thread(s3.upload_image, showcase_bytes, render_id)
+            asset_url = render_result["url"] if render_result.get("success") else None
 
         for strategy in ["product_aware", "product_unaware"]:
             copy = build_manual_copy(params, strategy)
@@ -321,23 +540,26 @@ async def add_manual_image_creative(
 
 def build_manual_copy(params: CreativeParameters, strategy: str) -> dict:
     """Build simple copy for manual_image_upload creative."""
+    product_name = params.product_name
+    key_benefit = params.key_benefit
     if strategy == "product_aware":
-        primary = f"Discover {params.product_name}"
-        if params.key_benefit:
-            primary += f" — {params.key_benefit}"
-        headline = params.headline or params.product_name
+        primary = f"Discover {product_name}"
+        if key_benefit:
+            primary += f" — {key_benefit}"
+        headline = params.headline or product_name
     else:
-        if params.customer_pains:
-            primary = f"Tired of {params.customer_pains[0].lower().rstrip('.')}? {params.product_name} can help."
-        elif params.key_benefit:
-            primary = f"What if you could {params.key_benefit.lower().rstrip('.')}?"
+        pains = params.customer_pains
+        if pains:
+            primary = f"Tired of {pains[0].lower().rstrip('.')}? {product_name} can help."
+        elif key_benefit:
+            primary = f"What if you could {key_benefit.lower().rstrip('.')}?"
         else:
-            primary = f"There's a better way. Meet {params.product_name}."
-        headline = params.subheadline or params.product_name
+            primary = f"There's a better way. Meet {product_name}."
+        headline = params.subheadline or product_name
 
     return {
         "primary_text": primary[:500],
-        "headline": (headline or params.product_name)[:40],
+        "headline": (headline or product_name)[:40],
         "description": (params.product_description_short or "")[:30] or None,
         "cta_type": "SIGN_UP" if params.business_type == "saas" else "LEARN_MORE",
     }
@@ -9,6 +9,7 @@ import os
 from typing import Optional
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,10 @@ RENDERER_URL = os.environ.get("RENDERER_URL", "http://localhost:3100")
 RENDERER_API_KEY = os.environ.get("RENDERER_API_KEY", "")
 RENDER_TIMEOUT = 30.0  # seconds per render
 
+# Request bodies are encoded with orjson rather than httpx's stdlib json —
+# canvases can carry large base64 image payloads.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 _client: Optional[httpx.AsyncClient] = None
 
 
@@ -26,14 +31,28 @@ def _get_client() -> httpx.AsyncClient:
         headers = {}
         if RENDERER_API_KEY:
             headers["X-API-Key"] = RENDERER_API_KEY
+        # One pooled client for all renders: keep-alive connections are reused
+        # across concurrent requests, and connect failures are retried.
         _client = httpx.AsyncClient(
             base_url=RENDERER_URL,
-            timeout=RENDER_TIMEOUT,
+            timeout=httpx.Timeout(RENDER_TIMEOUT, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
             headers=headers,
         )
     return _client
 
 
+async def aclose_client() -> None:
+    """Close the shared renderer client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 async def render_canvas(
     canvas_json: dict,
     width: int = 1080,
@@ -61,13 +80,14 @@ async def render_canvas(
     client = _get_client()
     resp = await client.post(
         "/render",
-        json={
+        content=orjson.dumps({
             "canvas_json": canvas_json,
             "width": width,
             "height": height,
             "format": fmt,
             "quality": quality,
-        },
+        }),
+        headers=_JSON_HEADERS,
     )
     resp.raise_for_status()
     return resp.content
@@ -90,11 +110,12 @@ async def render_batch(
     client = _get_client()
     resp = await client.post(
         "/render/batch",
-        json={"items": items},
+        content=orjson.dumps({"items": items}),
+        headers=_JSON_HEADERS,
         timeout=RENDER_TIMEOUT * len(items),
     )
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     return data.get("results", [])
 
 
@@ -6,9 +6,12 @@ Each template uses {{variable}} placeholders that get resolved at render time.
 Run: python -m app.services.v2.seed_templates.generate
 """
 
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 # Canvas sizes per aspect ratio
 SIZES = {
     "1:1": (1080, 1080),
@@ -20,37 +23,58 @@ ASPECT_RATIOS = list(SIZES.keys())
 OUTPUT_DIR = Path(__file__).parent
 
 
+# Default Fabric.js objects; builders copy these and fill in their fields.
+# Key order matters — it is the key order of the generated JSON.
+_TEXT_PROTO = {
+    "type": "textbox",
+    "text": "",
+    "left": 0,
+    "top": 0,
+    "width": 0,
+    "fontFamily": "Inter",
+    "fontSize": 40,
+    "fontWeight": "normal",
+    "fill": "#FFFFFF",
+    "textAlign": "left",
+    "lineHeight": 1.3,
+    "selectable": True,
+}
+
+_RECT_PROTO = {
+    "type": "rect",
+    "left": 0,
+    "top": 0,
+    "width": 0,
+    "height": 0,
+    "fill": "#1A365D",
+    "rx": 0,
+    "ry": 0,
+    "selectable": True,
+}
+
+
 def _text(text: str, left: int, top: int, width: int, **kwargs) -> dict:
-    """Create a Fabric.js text object."""
-    return {
-        "type": "textbox",
-        "text": text,
-        "left": left,
-        "top": top,
-        "width": width,
-        "fontFamily": kwargs.get("fontFamily", "Inter"),
-        "fontSize": kwargs.get("fontSize", 40),
-        "fontWeight": kwargs.get("fontWeight", "normal"),
-        "fill": kwargs.get("fill", "#FFFFFF"),
-        "textAlign": kwargs.get("textAlign", "left"),
-        "lineHeight": kwargs.get("lineHeight", 1.3),
-        "selectable": True,
-    }
+    """Create a Fabric.js text object (kwargs override _TEXT_PROTO styles)."""
+    obj = _TEXT_PROTO.copy()
+    obj["text"] = text
+    obj["left"] = left
+    obj["top"] = top
+    obj["width"] = width
+    if kwargs:
+        obj.update(kwargs)
+    return obj
 
 
 def _rect(left: int, top: int, width: int, height: int, **kwargs) -> dict:
-    """Create a Fabric.js rectangle."""
-    return {
-        "type": "rect",
-        "left": left,
-        "top": top,
-        "width": width,
-        "height": height,
-        "fill": kwargs.get("fill", "#1A365D"),
-        "rx": kwargs.get("rx", 0),
-        "ry": kwargs.get("ry", 0),
-        "selectable": True,
-    }
+    """Create a Fabric.js rectangle (kwargs override _RECT_PROTO styles)."""
+    obj = _RECT_PROTO.copy()
+    obj["left"] = left
+    obj["top"] = top
+    obj["width"] = width
+    obj["height"] = height
+    if kwargs:
+        obj.update(kwargs)
+    return obj
 
 
 def _canvas(w: int, h: int, objects: list, bg: str = "#1A365D") -> dict:
@@ -288,25 +312,52 @@ AD_TYPE_BUILDERS = {
 }
 
 
-def generate_all():
-    """Generate all 24 template JSON files."""
-    count = 0
-    for ad_type_id, builder in AD_TYPE_BUILDERS.items():
-        for ratio in ASPECT_RATIOS:
-            w, h = SIZES[ratio]
-            canvas_json = builder(w, h)
+def template_path(ad_type_id: str, ratio: str) -> Path:
+    """Path of the generated JSON for one (ad type, aspect ratio)."""
+    ratio_slug = ratio.replace(":", "x").replace(".", "_")
+    return OUTPUT_DIR / f"{ad_type_id}_{ratio_slug}.json"
+
+
+@lru_cache(maxsize=None)
+def load_template(ad_type_id: str, ratio: str) -> dict:
+    """Load a generated template from disk, parsed once per process.
+
+    The returned dict is shared — copy it before mutating.
+    """
+    return orjson.loads(template_path(ad_type_id, ratio).read_bytes())
+
 
-            ratio_slug = ratio.replace(":", "x").replace(".", "_")
-            filename = f"{ad_type_id}_{ratio_slug}.json"
-            filepath = OUTPUT_DIR / filename
+def _write_if_changed(filepath: Path, content: bytes) -> bool:
+    """Write content unless the file already holds it. Returns True if written."""
+    if filepath.exists() and filepath.read_bytes() == content:
+        return False
+    filepath.write_bytes(content)
+    return True
 
-            with open(filepath, "w") as f:
-                json.dump(canvas_json, f, indent=2)
 
+def generate_all():
+    """Generate all 24 template JSON files, skipping ones already up to date."""
+    outputs = [
+        (
+            template_path(ad_type_id, ratio),
+            orjson.dumps(builder(*SIZES[ratio]), option=orjson.OPT_INDENT_2),
+        )
+        for ad_type_id, builder in AD_TYPE_BUILDERS.items()
+        for ratio in ASPECT_RATIOS
+    ]
+
+    # Writes are independent blocking syscalls; overlap them
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        written = list(pool.map(lambda item: _write_if_changed(*item), outputs))
+
+    count = 0
+    for (filepath, _), changed in zip(outputs, written):
+        if changed:
             count += 1
-            print(f"  Generated: {filename}")
+            print(f"  Generated: {filepath.name}")
 
-    print(f"\nTotal: {count} templates generated in {OUTPUT_DIR}")
+    load_template.cache_clear()
+    print(f"\nTotal: {count} templates generated, {len(outputs) - count} unchanged in {OUTPUT_DIR}")
 
 
 if __name__ == "__main__":
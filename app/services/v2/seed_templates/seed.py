@@ -5,9 +5,11 @@ Run: python -m app.services.v2.seed_templates.seed
 """
 
 import asyncio
-import json
+import re
 from pathlib import Path
 
+from app.services.v2.seed_templates.generate import load_template
+
 TEMPLATE_DIR = Path(__file__).parent
 
 # Display names for ad types
@@ -22,73 +24,88 @@ AD_TYPE_NAMES = {
     "us_vs_them_problem": "Us vs Them (Before/After)",
 }
 
+SLUG_TO_RATIO = {"1x1": "1:1", "9x16": "9:16", "1_91x1": "1.91:1"}
+RATIO_LABELS = {"1:1": "Square", "9:16": "Story", "1.91:1": "Landscape"}
+
+# {ad_type_id}_{ratio_slug}, e.g. "product_benefits_static_1_91x1"
+_STEM_RE = re.compile(rf"^(.+)_({'|'.join(map(re.escape, SLUG_TO_RATIO))})$")
+
 
 async def seed_templates():
-    """Load all JSON template files into DB."""
-    from prisma import Prisma
+    """Load all JSON template files into DB.
+
+    Uses the app's shared Prisma client. When called inside a running app
+    (already connected) the connection is reused and left open; standalone
+    runs connect and disconnect.
+    """
+    from prisma import Json
 
-    db = Prisma()
-    await db.connect()
+    from app.db import db
 
     json_files = sorted(TEMPLATE_DIR.glob("*.json"))
     if not json_files:
         print("No template JSON files found. Run generate.py first.")
         return
 
-    created = 0
-    skipped = 0
-
+    # (ad_type_id, aspect_ratio, full_name)
+    entries: list[tuple[str, str, str]] = []
     for filepath in json_files:
-        # Parse filename: {ad_type_id}_{ratio_slug}.json
-        stem = filepath.stem  # e.g. "product_benefits_static_1x1"
-        # Find ratio slug at end
-        for ratio, slug in [("1:1", "1x1"), ("9:16", "9x16"), ("1.91:1", "1_91x1")]:
-            if stem.endswith(f"_{slug}"):
-                ad_type_id = stem[: -(len(slug) + 1)]
-                aspect_ratio = ratio
-                break
-        else:
+        match = _STEM_RE.match(filepath.stem)
+        if not match:
             print(f"  Skipping unrecognized file: {filepath.name}")
             continue
+        ad_type_id, slug = match.groups()
+        aspect_ratio = SLUG_TO_RATIO[slug]
 
         name = AD_TYPE_NAMES.get(ad_type_id, ad_type_id)
-        ratio_label = {"1:1": "Square", "9:16": "Story", "1.91:1": "Landscape"}
-        full_name = f"{name} — {ratio_label.get(aspect_ratio, aspect_ratio)}"
-
-        with open(filepath) as f:
-            canvas_json = json.load(f)
-
-        # Upsert: check if exists first
-        existing = await db.adtemplate.find_first(
-            where={
-                "ad_type_id": ad_type_id,
-                "aspect_ratio": aspect_ratio,
-                "is_default": True,
-            }
+        full_name = f"{name} — {RATIO_LABELS[aspect_ratio]}"
+        entries.append((ad_type_id, aspect_ratio, full_name))
+
+    async def _read_canvas(ad_type_id: str, aspect_ratio: str) -> Json:
+        return Json(await asyncio.to_thread(load_template, ad_type_id, aspect_ratio))
+
+    owns_connection = not db.is_connected()
+    if owns_connection:
+        await db.connect()
+    try:
+        # File reads run in threads while the existing-defaults query is in flight
+        existing, *canvases = await asyncio.gather(
+            db.adtemplate.find_many(where={"is_default": True}),
+            *(_read_canvas(ad_type_id, aspect_ratio) for ad_type_id, aspect_ratio, _ in entries),
         )
-
-        if existing:
-            await db.adtemplate.update(
-                where={"id": existing.id},
-                data={"canvas_json": json.dumps(canvas_json), "name": full_name},
-            )
-            skipped += 1
-            print(f"  Updated: {full_name}")
-        else:
-            await db.adtemplate.create(
-                data={
+        existing_ids = {(t.ad_type_id, t.aspect_ratio): t.id for t in existing}
+
+        to_create = []
+        to_update = []
+        for (ad_type_id, aspect_ratio, full_name), canvas in zip(entries, canvases):
+            template_id = existing_ids.get((ad_type_id, aspect_ratio))
+            if template_id:
+                to_update.append((template_id, {"canvas_json": canvas, "name": full_name}))
+            else:
+                to_create.append({
                     "ad_type_id": ad_type_id,
                     "aspect_ratio": aspect_ratio,
                     "name": full_name,
-                    "canvas_json": json.dumps(canvas_json),
+                    "canvas_json": canvas,
                     "is_default": True,
-                }
-            )
-            created += 1
-            print(f"  Created: {full_name}")
-
-    await db.disconnect()
-    print(f"\nDone: {created} created, {skipped} updated")
+                })
+
+        if to_create:
+            await db.adtemplate.create_many(data=to_create)
+        if to_update:
+            # Batched queries are sent together and run in one transaction
+            async with db.batch_() as batcher:
+                for template_id, data in to_update:
+                    batcher.adtemplate.update(where={"id": template_id}, data=data)
+    finally:
+        if owns_connection:
+            await db.disconnect()
+
+    for row in to_create:
+        print(f"  Created: {row['name']}")
+    for _, data in to_update:
+        print(f"  Updated: {data['name']}")
+    print(f"\nDone: {len(to_create)} created, {len(to_update)} updated")
 
 
 if __name__ == "__main__":
@@ -9,37 +9,74 @@ import logging
 import random
 
 from app.schemas.creative_params import CreativeParameters
+from app.services.v2.social_templates.branded_static import BrandedStaticParams
+from app.services.v2.social_templates.person_centric import PersonCentricParams
+from app.services.v2.social_templates.problem_statement import ProblemStatementParams
+from app.services.v2.social_templates.product_centric import ProductCentricParams
+from app.services.v2.social_templates.reddit_post import RedditPostParams
+from app.services.v2.social_templates.review_static import ReviewStaticParams
+from app.services.v2.social_templates.service_hero import ServiceHeroParams
 
 logger = logging.getLogger(__name__)
 
+# Product category -> subreddit for the reddit post mock
+SUBREDDIT_MAP = {
+    "skincare": "r/SkincareAddiction",
+    "fitness": "r/fitness",
+    "saas": "r/SaaS",
+    "software": "r/software",
+    "health": "r/health",
+    "food": "r/food",
+    "finance": "r/personalfinance",
+}
 
-def bridge_branded_static(
-    params: CreativeParameters,
-    scraped_data: dict,
-    copy: dict,
-):
-    """Map scraped design tokens → BrandedStaticParams."""
-    from app.services.v2.social_templates.branded_static import BrandedStaticParams
+REVIEWER_NAMES = ("Sarah K.", "Mike R.", "Jessica L.", "David M.", "Emma T.")
 
-    styling = scraped_data.get("styling", {})
-    css_assets = scraped_data.get("css_assets", {})
-    design_tokens = scraped_data.get("design_tokens", {})
+# Module-private RNG for the mock engagement numbers and names
+_rng = random.Random()
+
+# Brand colors too close to white to use as a background or accent
+_NEAR_WHITE = frozenset({"#ffffff", "#f7f7f7", "#fafafa"})
+# ...and for the problem-statement background, pure black too
+_UNUSABLE_BG = _NEAR_WHITE | {"#000000"}
+
+# First hex digit of a light background (#c00000 and up)
+_LIGHT_NIBBLES = frozenset("cdefCDEF")
+
+
+def _is_light(bg_color: str) -> bool:
+    """True for hex backgrounds light enough to need dark text."""
+    return bg_color[:1] == "#" and bg_color[1:2] in _LIGHT_NIBBLES
 
-    # Colors
+
+def _derive_palette(scraped_data: dict) -> tuple[str, str, str, str | None]:
+    """Pick (bg_color, accent, text_color, bg_gradient) from scraped styling."""
+    styling = scraped_data.get("styling", {})
     bgs = styling.get("backgrounds", [])
     accents = styling.get("accents", [])
-    texts = styling.get("text", [])
 
     bg_color = bgs[0] if bgs else "#0f172a"
     accent = accents[0] if accents else "#3b82f6"
     text_color = "#ffffff"
-    bg_lower = bg_color.lower()
-    if bg_lower.startswith("#f") or bg_lower.startswith("#e") or bg_lower.startswith("#d") or bg_lower.startswith("#c") or bg_lower == "#ffffff":
+    if _is_light(bg_color):
+        texts = styling.get("text", [])
         text_color = texts[0] if texts else "#1a202c"
 
-    # Gradient or solid
-    gradients = design_tokens.get("gradients", [])
-    bg_gradient = gradients[0]["raw"] if gradients else None
+    gradients = scraped_data.get("design_tokens", {}).get("gradients") or [{}]
+    return bg_color, accent, text_color, gradients[0].get("raw")
+
+
+def bridge_branded_static(
+    params: CreativeParameters,
+    scraped_data: dict,
+    copy: dict,
+):
+    """Map scraped design tokens → BrandedStaticParams."""
+    styling = scraped_data.get("styling", {})
+    css_assets = scraped_data.get("css_assets", {})
+    design_tokens = scraped_data.get("design_tokens", {})
+
+    bg_color, accent, text_color, bg_gradient = _derive_palette(scraped_data)
 
     # Fonts
     fonts = styling.get("fonts", ["Inter"])
@@ -79,41 +116,32 @@ def bridge_branded_static(
     )
 
 
-def bridge_reddit(params: CreativeParameters, copy: dict):
-    """Map CreativeParameters + copy → RedditPostParams."""
-    from app.services.v2.social_templates.reddit_post import RedditPostParams
+def bridge_reddit(params: CreativeParameters, copy: dict, rng: random.Random = _rng):
+    """Map CreativeParameters + copy → RedditPostParams.
 
+    rng draws the mock username and engagement numbers; pass a seeded
+    random.Random for reproducible values.
+    """
     # Build post body from copy
     body = copy.get("primary_text", f"Genuinely surprised by {params.product_name}. It actually lives up to the hype.")
 
     # Subreddit based on category
     category = params.product_category or "technology"
-    subreddit_map = {
-        "skincare": "r/SkincareAddiction",
-        "fitness": "r/fitness",
-        "saas": "r/SaaS",
-        "software": "r/software",
-        "health": "r/health",
-        "food": "r/food",
-        "finance": "r/personalfinance",
-    }
-    subreddit = subreddit_map.get(category.lower(), f"r/{category}")
+    subreddit = SUBREDDIT_MAP.get(category.lower(), f"r/{category}")
 
     return RedditPostParams(
-        username=f"honest_reviewer_{random.randint(10, 99)}",
+        username=f"honest_reviewer_{rng.randint(10, 99)}",
         body=body,
         subreddit=subreddit,
-        upvotes=random.randint(150, 800),
-        comments=random.randint(20, 120),
+        upvotes=rng.randint(150, 800),
+        comments=rng.randint(20, 120),
         dark_mode=False,
-        time_ago=f"{random.randint(2, 12)}h",
+        time_ago=f"{rng.randint(2, 12)}h",
     )
 
 
 def bridge_problem_statement(params: CreativeParameters, copy: dict):
     """Map CreativeParameters → ProblemStatementParams."""
-    from app.services.v2.social_templates.problem_statement import ProblemStatementParams
-
     # For non-English: prefer translated copy headline (fully translated by translate_copy)
     # For English: use pain point from params (already English)
     if params.language and params.language != "en" and copy.get("headline"):
@@ -129,7 +157,7 @@ def bridge_problem_statement(params: CreativeParameters, copy: dict):
     bg_color = "#1A202C"
     if params.brand_colors and params.brand_colors.primary:
         bc = params.brand_colors.primary
-        if bc.lower() not in ("#ffffff", "#f7f7f7", "#fafafa", "#000000"):
+        if bc.lower() not in _UNUSABLE_BG:
             bg_color = bc
 
     return ProblemStatementParams(
@@ -141,10 +169,12 @@ def bridge_problem_statement(params: CreativeParameters, copy: dict):
     )
 
 
-def bridge_review_static(params: CreativeParameters, copy: dict):
-    """Map CreativeParameters → ReviewStaticParams."""
-    from app.services.v2.social_templates.review_static import ReviewStaticParams
+def bridge_review_static(params: CreativeParameters, copy: dict, rng: random.Random = _rng):
+    """Map CreativeParameters → ReviewStaticParams.
 
+    rng picks the mock reviewer name; pass a seeded random.Random for a
+    reproducible pick.
+    """
     # Pick testimonial text (testimonials from scraping are already in native language)
     if params.testimonials:
         review_text = params.testimonials[0]
@@ -161,15 +191,13 @@ def bridge_review_static(params: CreativeParameters, copy: dict):
     accent = "#FF6B35"
     if params.brand_colors:
         bc = params.brand_colors
-        for c in [bc.secondary, bc.accent, bc.primary]:
-            if c and c.startswith("#") and c.lower() not in ("#ffffff", "#f7f7f7", "#fafafa"):
+        for c in (bc.secondary, bc.accent, bc.primary):
+            if c and c.startswith("#") and c.lower() not in _NEAR_WHITE:
                 accent = c
                 break
 
-    reviewer_names = ["Sarah K.", "Mike R.", "Jessica L.", "David M.", "Emma T."]
-
     return ReviewStaticParams(
-        reviewer_name=random.choice(reviewer_names),
+        reviewer_name=rng.choice(REVIEWER_NAMES),
         review_text=review_text,
         rating=5,
         product_name=params.product_name,
@@ -181,8 +209,6 @@ def bridge_review_static(params: CreativeParameters, copy: dict):
 
 def bridge_service_hero(params: CreativeParameters, copy: dict):
     """Map CreativeParameters → ServiceHeroParams."""
-    from app.services.v2.social_templates.service_hero import ServiceHeroParams
-
     # params.headline is from scraping (native language)
     # params.key_benefit is translated by translate_params
     headline = params.headline or params.key_benefit or params.product_name
@@ -207,26 +233,8 @@ def bridge_product_centric(
     copy: dict,
 ):
     """Map CreativeParameters + scraped data → ProductCentricParams."""
-    from app.services.v2.social_templates.product_centric import ProductCentricParams
-
-    styling = scraped_data.get("styling", {})
-
-    # Colors — same pattern as bridge_branded_static
-    bgs = styling.get("backgrounds", [])
-    accents = styling.get("accents", [])
-    texts = styling.get("text", [])
-
-    bg_color = bgs[0] if bgs else "#0f172a"
-    accent = accents[0] if accents else "#3b82f6"
-    text_color = "#ffffff"
-    bg_lower = bg_color.lower()
-    if bg_lower.startswith("#f") or bg_lower.startswith("#e") or bg_lower.startswith("#d") or bg_lower.startswith("#c") or bg_lower == "#ffffff":
-        text_color = texts[0] if texts else "#1a202c"
-
-    # Gradient or solid
+    bg_color, accent, text_color, bg_gradient = _derive_palette(scraped_data)
     design_tokens = scraped_data.get("design_tokens", {})
-    gradients = design_tokens.get("gradients", [])
-    bg_gradient = gradients[0]["raw"] if gradients else None
 
     # Headline
     headline = copy.get("headline") or params.headline or params.key_benefit or params.product_name
@@ -266,8 +274,6 @@ def bridge_product_centric(
 
 def bridge_person_centric(params: CreativeParameters, copy: dict):
     """Map CreativeParameters + copy → PersonCentricParams."""
-    from app.services.v2.social_templates.person_centric import PersonCentricParams
-
     headline = copy.get("headline") or params.headline or params.product_name
     subheadline = params.key_benefit or copy.get("description") or params.product_description_short or None
 
@@ -276,7 +282,7 @@ def bridge_person_centric(params: CreativeParameters, copy: dict):
     accent = "#3b82f6"
     if params.brand_colors:
         bc = params.brand_colors
-        if bc.primary and bc.primary.lower() not in ("#ffffff", "#f7f7f7", "#fafafa"):
+        if bc.primary and bc.primary.lower() not in _NEAR_WHITE:
             bg_color = bc.primary
         if bc.accent:
             accent = bc.accent
@@ -304,18 +310,7 @@ def bridge_branded_static_video(
     copy: dict,
 ) -> dict:
     """Map scraped design tokens → Remotion BrandedStatic props dict."""
-    styling = scraped_data.get("styling", {})
-
-    bgs = styling.get("backgrounds", [])
-    accents = styling.get("accents", [])
-    texts = styling.get("text", [])
-
-    bg_color = bgs[0] if bgs else "#0f172a"
-    accent = accents[0] if accents else "#3b82f6"
-    text_color = "#ffffff"
-    bg_lower = bg_color.lower()
-    if bg_lower.startswith("#f") or bg_lower.startswith("#e") or bg_lower.startswith("#d") or bg_lower.startswith("#c") or bg_lower == "#ffffff":
-        text_color = texts[0] if texts else "#1a202c"
+    bg_color, accent, text_color, _ = _derive_palette(scraped_data)
 
     headers = scraped_data.get("headers", [])
     headline = headers[0] if headers else params.headline or params.product_name
@@ -10,10 +10,12 @@ import html as html_mod
 import logging
 from dataclasses import dataclass
 
+from app.services.v2.browser_pool import acquire_page, screenshot, wait_for_fonts
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrandedStaticParams:
     headline: str = "Your headline here"
     description: str = ""
@@ -164,31 +166,16 @@ body {{
 
 async def render_branded_static(params: BrandedStaticParams | None = None) -> bytes:
     """Render branded static ad to PNG bytes via Playwright."""
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = BrandedStaticParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
-        await page.set_content(page_html, wait_until="networkidle")
-        # Wait for Google Fonts to load
-        try:
-            await page.wait_for_timeout(2000)
-        except Exception:
-            pass
-
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+    async with acquire_page() as page:
+        # "load" covers the Google Fonts stylesheet; the font files load on use
+        await page.set_content(page_html, wait_until="load")
+        await wait_for_fonts(page)
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Branded static rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
@@ -9,10 +9,12 @@ import html
 import logging
 from dataclasses import dataclass
 
+from app.services.v2.browser_pool import acquire_page, screenshot
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InstagramStoryParams:
     username: str = "user_name"
     body: str = "This changed everything for me"
@@ -243,25 +245,14 @@ body {{
 
 
 async def render_instagram_story(params: InstagramStoryParams | None = None) -> bytes:
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = InstagramStoryParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
+    async with acquire_page() as page:
         await page.set_content(page_html, wait_until="load")
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Instagram Story rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
@@ -5,18 +5,36 @@ Two parts:
 1. Person image generation via Gemini 2.5 Flash Image (same model as image_editor.py)
 2. HTML rendering via Playwright (headline + person image + CTA)
 
-Self-contained: inline CSS, base64 image embed, system fonts.
+Self-contained: inline CSS, system fonts. The person image is served to the
+page by request interception rather than inlined as a base64 data URI.
 """
 
-import base64
 import html as html_mod
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+
+from app.services.v2.browser_pool import acquire_page, screenshot
 
 logger = logging.getLogger(__name__)
 
+# Never fetched over the network: render_person_centric fulfills requests for
+# it from person_image_bytes, so the image skips base64 encoding and the HTML
+# parser entirely
+_PERSON_IMAGE_URL = "https://render.local/person.png"
+
+# google.genai.Client per API key, created on first use and reused so person
+# images share one connection pool instead of a fresh TLS handshake per
+# generation. Keyed so a rotated GOOGLE_API_KEY gets its own client.
+@lru_cache(maxsize=4)
+def _get_genai_client(api_key: str):
+    from google import genai
+    return genai.Client(api_key=api_key)
+
 
+# Brand colors repeat across renders, so both helpers are memoized
+@lru_cache(maxsize=256)
 def _perceived_brightness(hex_color: str) -> float:
     """Perceived brightness 0-255 using ITU-R BT.601 weights."""
     h = hex_color.lstrip("#")
@@ -29,12 +47,13 @@ def _perceived_brightness(hex_color: str) -> float:
     return 0.299 * r + 0.587 * g + 0.114 * b
 
 
+@lru_cache(maxsize=256)
 def _text_on(bg_hex: str) -> str:
     """Return white or dark text color based on background brightness."""
     return "#FFFFFF" if _perceived_brightness(bg_hex) < 150 else "#1C1C1C"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PersonCentricParams:
     headline: str = "Your headline here"
     subheadline: str | None = None
@@ -66,10 +85,9 @@ async def generate_person_image(params) -> bytes | None:
         return None
 
     try:
-        from google import genai
         from google.genai import types
 
-        client = genai.Client(api_key=api_key)
+        client = _get_genai_client(api_key)
 
         # Build persona description
         persona_desc = ""
@@ -134,11 +152,10 @@ def _build_html(params: PersonCentricParams) -> str:
     if params.logo_url:
         logo_html = f'<img class="logo" src="{html_mod.escape(params.logo_url)}" alt="Logo">'
 
-    # Person image — embedded as base64 data URI
+    # Person image — served from person_image_bytes (see _PERSON_IMAGE_URL)
     person_html = ""
     if params.person_image_bytes:
-        b64 = base64.b64encode(params.person_image_bytes).decode()
-        person_html = f'<img class="person-image" src="data:image/png;base64,{b64}" alt="Person">'
+        person_html = f'<img class="person-image" src="{_PERSON_IMAGE_URL}" alt="Person">'
     else:
         # Placeholder circle when no person image
         person_html = '<div class="person-placeholder"></div>'
@@ -298,27 +315,21 @@ body {{
 
 async def render_person_centric(params: PersonCentricParams | None = None) -> bytes:
     """Render person centric ad to PNG bytes via Playwright."""
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = PersonCentricParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
+    async with acquire_page() as page:
+        image_bytes = params.person_image_bytes
+        if image_bytes:
+            await page.route(
+                _PERSON_IMAGE_URL,
+                lambda route: route.fulfill(body=image_bytes, content_type="image/png"),
+            )
+        # "load" fires once the person image has loaded
         await page.set_content(page_html, wait_until="load")
-        # Wait for base64 image to render
-        await page.wait_for_timeout(1000)
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Person centric rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
@@ -3,41 +3,89 @@ Product Showcase Template — Manual image upload with optional text overlay.
 
 Takes an uploaded image as-is and optionally overlays a price tag or headline.
 The 9th creative type: user provides the image, we just render it (+ optional text).
+Without overlay text the render is a plain center-crop, done in Pillow instead
+of Chromium.
 """
 
-import base64
+import asyncio
 import html
+import io
 import logging
 import mimetypes
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
+from app.services.v2.browser_pool import (
+    DEVICE_SCALE_FACTOR,
+    acquire_page,
+    screenshot,
+    wait_for_images,
+)
+from app.services.v2.http_client import fetch_image
+
+try:
+    # SIMD-accelerated encoder with the same API; product photos run to MBs
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class ProductShowcaseParams:
     product_image_url: str = ""          # required: URL or file:// path
+    product_image_bytes: bytes | None = None  # preferred over the URL when set (inlined as data URI)
     overlay_text: str | None = None      # optional: price tag, headline, etc.
     overlay_position: str = "bottom-left" # bottom-left, bottom-right, top-left, top-right, center
 
 
-def _resolve_image_url(url: str) -> str:
-    """Convert file:// URLs to data URIs so set_content can display them."""
+def _local_image_path(url: str) -> Path | None:
+    """Filesystem path for a file:// URL that exists, else None."""
     if not url.startswith("file://"):
-        return url
+        return None
     path = Path(unquote(urlparse(url).path))
     if not path.is_file():
         logger.warning(f"Local image not found: {path}")
+        return None
+    return path
+
+
+def _resolve_image_url(url: str) -> str:
+    """Convert file:// URLs to data URIs so set_content can display them."""
+    path = _local_image_path(url)
+    if path is None:
         return url
     mime = mimetypes.guess_type(str(path))[0] or "image/png"
-    b64 = base64.b64encode(path.read_bytes()).decode()
+    b64 = base64.b64encode(path.read_bytes()).decode("ascii")
     return f"data:{mime};base64,{b64}"
 
 
+def _fit_square(image_bytes: bytes, size: int) -> bytes:
+    """Center-crop and scale to a size x size PNG — what the template's
+    object-fit: cover renders, including EXIF rotation and the page's white
+    background behind transparency."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(image_bytes)) as src:
+        img = ImageOps.exif_transpose(src)
+        if img.mode != "RGB":
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, "white")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        img = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
 def _build_html(params: ProductShowcaseParams) -> str:
-    image_url = html.escape(_resolve_image_url(params.product_image_url))
+    if params.product_image_bytes:
+        b64 = base64.b64encode(params.product_image_bytes).decode("ascii")
+        image_url = f"data:image/png;base64,{b64}"
+    else:
+        image_url = html.escape(_resolve_image_url(params.product_image_url))
 
     # Position mapping
     pos = params.overlay_position
@@ -108,26 +156,37 @@ body {{
 
 
 async def render_product_showcase(params: ProductShowcaseParams | None = None) -> bytes:
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = ProductShowcaseParams()
 
+    # Fetch remote images here (pooled, cached) so the page embeds them
+    # instead of loading them over the browser's network stack
+    if params.product_image_bytes is None and params.product_image_url:
+        image_bytes = await fetch_image(params.product_image_url)
+        if image_bytes:
+            params = replace(params, product_image_bytes=image_bytes)
+
+    if not params.overlay_text:
+        image_bytes = params.product_image_bytes
+        if image_bytes is None and (path := _local_image_path(params.product_image_url)):
+            image_bytes = await asyncio.to_thread(path.read_bytes)
+        if image_bytes:
+            try:
+                png = await asyncio.to_thread(
+                    _fit_square, image_bytes, 1080 * DEVICE_SCALE_FACTOR
+                )
+            except Exception as e:
+                logger.warning(f"Pillow showcase failed, rendering in Chromium: {e}")
+            else:
+                logger.info(f"Product showcase cropped: {len(png) // 1024}KB")
+                return png
+
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
-        await page.set_content(page_html, wait_until="networkidle")
-        await page.wait_for_timeout(1500)
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+    async with acquire_page() as page:
+        await page.set_content(page_html, wait_until="load")
+        await wait_for_images(page)
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Product showcase rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
@@ -7,8 +7,11 @@ Self-contained: inline SVG icons, system fonts, no external dependencies.
 
 import html
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
 
+from app.services.v2.browser_pool import acquire_page, screenshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,29 +29,48 @@ class RedditPostParams:
     time_ago: str = "2h"
 
 
+# Color palettes
+_PALETTE_LIGHT = {
+    "bg": "#DAE0E6",
+    "card_bg": "#FFFFFF",
+    "border_color": "#EDEFF1",
+    "text_primary": "#1C1C1C",
+    "text_secondary": "#787C7E",
+    "icon_color": "#878A8C",
+    "vote_bar_bg": "#F8F9FA",
+}
+_PALETTE_DARK = {
+    "bg": "#030303",
+    "card_bg": "#1A1A1B",
+    "border_color": "#343536",
+    "text_primary": "#D7DADC",
+    "text_secondary": "#818384",
+    "icon_color": "#818384",
+    "vote_bar_bg": "#161617",
+}
+
+
+# _format_count formats by magnitude: below 1k, below 100k, 100k and up
+_COUNT_THRESHOLDS = (1_000, 100_000)
+_COUNT_FORMATS = ("{:d}", "{:.1f}k", "{:.0f}k")
+
+
 def _format_count(n: int) -> str:
     """Format number: 1234 -> 1.2k, 999 -> 999."""
-    if n >= 100_000:
-        return f"{n / 1_000:.0f}k"
-    if n >= 10_000:
-        return f"{n / 1_000:.1f}k"
-    if n >= 1_000:
-        return f"{n / 1_000:.1f}k"
-    return str(n)
+    fmt = _COUNT_FORMATS[bisect_right(_COUNT_THRESHOLDS, n)]
+    return fmt.format(n if n < 1_000 else n / 1_000)
 
 
 def _build_html(params: RedditPostParams) -> str:
     """Build self-contained HTML matching Reddit's post UI."""
-    dark = params.dark_mode
-
-    # Color palette
-    bg = "#030303" if dark else "#DAE0E6"
-    card_bg = "#1A1A1B" if dark else "#FFFFFF"
-    border_color = "#343536" if dark else "#EDEFF1"
-    text_primary = "#D7DADC" if dark else "#1C1C1C"
-    text_secondary = "#818384" if dark else "#787C7E"
-    icon_color = "#818384" if dark else "#878A8C"
-    vote_bar_bg = "#161617" if dark else "#F8F9FA"
+    palette = _PALETTE_DARK if params.dark_mode else _PALETTE_LIGHT
+    bg = palette["bg"]
+    card_bg = palette["card_bg"]
+    border_color = palette["border_color"]
+    text_primary = palette["text_primary"]
+    text_secondary = palette["text_secondary"]
+    icon_color = palette["icon_color"]
+    vote_bar_bg = palette["vote_bar_bg"]
 
     # Escaped content
     username = html.escape(params.username)
@@ -288,25 +310,14 @@ body {{
 
 async def render_reddit_post(params: RedditPostParams | None = None) -> bytes:
     """Render Reddit post to PNG bytes via Playwright."""
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = RedditPostParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
+    async with acquire_page() as page:
         await page.set_content(page_html, wait_until="load")
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Reddit post rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
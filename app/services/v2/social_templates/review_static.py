@@ -9,10 +9,15 @@ Self-contained: inline SVG, system fonts, no external dependencies.
 import html
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
+
+from app.services.v2.browser_pool import acquire_page, screenshot
 
 logger = logging.getLogger(__name__)
 
 
+# Brand colors repeat across renders, so both helpers are memoized
+@lru_cache(maxsize=256)
 def _perceived_brightness(hex_color: str) -> float:
     """Perceived brightness 0-255 using ITU-R BT.601 weights."""
     h = hex_color.lstrip("#")
@@ -22,6 +27,7 @@ def _perceived_brightness(hex_color: str) -> float:
     return 0.299 * r + 0.587 * g + 0.114 * b
 
 
+@lru_cache(maxsize=256)
 def _text_on(bg_hex: str) -> str:
     """Return white or dark text color based on background brightness."""
     return "#FFFFFF" if _perceived_brightness(bg_hex) < 150 else "#1C1C1C"
@@ -213,25 +219,14 @@ body {{
 
 
 async def render_review_static(params: ReviewStaticParams | None = None) -> bytes:
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = ReviewStaticParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
+    async with acquire_page() as page:
         await page.set_content(page_html, wait_until="load")
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Review static rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
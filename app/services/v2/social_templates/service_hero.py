@@ -10,6 +10,8 @@ import html
 import logging
 from dataclasses import dataclass
 
+from app.services.v2.browser_pool import acquire_page, screenshot, wait_for_images
+
 logger = logging.getLogger(__name__)
 
 
@@ -161,27 +163,15 @@ body {{
 
 
 async def render_service_hero(params: ServiceHeroParams | None = None) -> bytes:
-    from playwright.async_api import async_playwright
-
     if params is None:
         params = ServiceHeroParams()
 
     page_html = _build_html(params)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(
-            viewport={"width": 1080, "height": 1080},
-            device_scale_factor=2,
-        )
-        await page.set_content(page_html, wait_until="networkidle")
-        # Extra wait for image loading
-        await page.wait_for_timeout(1500)
-        screenshot_bytes = await page.screenshot(
-            type="png",
-            clip={"x": 0, "y": 0, "width": 1080, "height": 1080},
-        )
-        await browser.close()
+    async with acquire_page() as page:
+        await page.set_content(page_html, wait_until="load")
+        await wait_for_images(page)
+        screenshot_bytes = await screenshot(page)
 
     logger.info(f"Service hero rendered: {len(screenshot_bytes) // 1024}KB")
     return screenshot_bytes
@@ -11,7 +11,6 @@ Same StaticAdRenderer interface so v2.py router doesn't change.
 """
 
 import io
-import json
 import logging
 import random
 import re
@@ -20,6 +19,13 @@ from typing import Optional
 import httpx
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
+try:
+    # SIMD-accelerated decoder with the same API; batch renders return a
+    # base64 PNG per aspect ratio
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from app.schemas.ad_types import AdTypeDefinition, LayerDefinition
 from app.schemas.creative_params import CreativeParameters
 from app.services.image_compositor import (
@@ -51,48 +57,126 @@ TEMPLATE_FALLBACK_MAP: dict[str, str] = {
 # =====================================================================
 
 
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+(?:\[\d+\])?(?:\.\w+)?)\}\}")
+_INDEXED_RE = re.compile(r"(\w+)\[(\d+)\]")
+
+
+def _compile_template(canvas_json: dict) -> list[tuple[tuple, str]]:
+    """
+    Walk a Fabric.js JSON dict once and return (path, text) for every string
+    that contains a {{variable}} placeholder. Paths are tuples of dict keys /
+    list indices from the root.
+    """
+    slots: list[tuple[tuple, str]] = []
+
+    def walk(node, path: tuple) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                walk(value, path + (key,))
+        elif isinstance(node, list):
+            for i, value in enumerate(node):
+                walk(value, path + (i,))
+        elif isinstance(node, str) and "{{" in node and _PLACEHOLDER_RE.search(node):
+            slots.append((path, node))
+
+    walk(canvas_json, ())
+    return slots
+
+
+# AdTemplate id -> (updated_at, canvas_json) for templates loaded from the
+# DB, so an unchanged template is the same dict on every render
+_db_canvases: dict[str, tuple[object, dict]] = {}
+# id(canvas_json) -> (canvas_json, slots) for those canvases. Each entry holds
+# its canvas, so the id cannot be reused by another dict while it exists.
+_compiled_slots: dict[int, tuple[dict, list[tuple[tuple, str]]]] = {}
+
+
+def _cached_canvas(template) -> dict:
+    """Return the canvas of an AdTemplate row, compiling it only when the row
+    is new or its updated_at changed."""
+    cached = _db_canvases.get(template.id)
+    if cached is not None and cached[0] == template.updated_at:
+        return cached[1]
+    if cached is not None:
+        _compiled_slots.pop(id(cached[1]), None)
+    canvas = template.canvas_json
+    _db_canvases[template.id] = (template.updated_at, canvas)
+    _compiled_slots[id(canvas)] = (canvas, _compile_template(canvas))
+    return canvas
+
+
+def _lookup_placeholder(
+    path: str,
+    params: CreativeParameters,
+    hook_text: str | None,
+) -> str:
+    """Resolve one placeholder path (e.g. value_props[0], brand_colors.primary)."""
+    # Hook overrides
+    if hook_text and path in ("problem_hook", "organic_hook"):
+        return hook_text
+
+    # Array indexing: value_props[0]
+    idx_match = _INDEXED_RE.match(path)
+    if idx_match:
+        field = idx_match.group(1)
+        idx = int(idx_match.group(2))
+        val = getattr(params, field, [])
+        if isinstance(val, list) and idx < len(val):
+            return str(val[idx])
+        return ""
+
+    # Dotted path: brand_colors.primary
+    obj = params
+    for part in path.split("."):
+        if hasattr(obj, part):
+            obj = getattr(obj, part)
+        else:
+            return ""
+    return str(obj) if obj is not None else ""
+
+
 def _resolve_template_variables(
     canvas_json: dict,
     params: CreativeParameters,
     hook_text: str | None = None,
 ) -> dict:
     """
-    Deep-walk a Fabric.js JSON dict, replacing {{variable}} placeholders
-    in text fields with values from CreativeParameters.
+    Return a copy of a Fabric.js JSON dict with {{variable}} placeholders
+    in text fields replaced by values from CreativeParameters.
+
+    Only the placeholder strings found by _compile_template are rewritten, and
+    only the containers on their paths are copied — untouched objects are
+    shared with canvas_json, so neither may be mutated afterwards. Canvases
+    loaded from the DB reuse their compiled slots; others (editor previews)
+    are compiled per call.
     """
-    json_str = json.dumps(canvas_json)
+    values: dict[str, str] = {}
 
     def replacer(match: re.Match) -> str:
-        path = match.group(1)
-
-        # Hook overrides
-        if hook_text and path in ("problem_hook", "organic_hook"):
-            return hook_text
-
-        # Array indexing: value_props[0]
-        idx_match = re.match(r"(\w+)\[(\d+)\]", path)
-        if idx_match:
-            field = idx_match.group(1)
-            idx = int(idx_match.group(2))
-            val = getattr(params, field, [])
-            if isinstance(val, list) and idx < len(val):
-                # JSON-safe escape
-                return str(val[idx]).replace('"', '\\"')
-            return ""
-
-        # Dotted path: brand_colors.primary
-        parts = path.split(".")
-        obj = params
-        for part in parts:
-            if hasattr(obj, part):
-                obj = getattr(obj, part)
-            else:
-                return ""
-        result = str(obj) if obj is not None else ""
-        return result.replace('"', '\\"')
-
-    resolved = re.sub(r"\{\{(\w+(?:\[\d+\])?(?:\.\w+)?)\}\}", replacer, json_str)
-    return json.loads(resolved)
+        name = match.group(1)
+        if name not in values:
+            values[name] = _lookup_placeholder(name, params, hook_text)
+        return values[name]
+
+    compiled = _compiled_slots.get(id(canvas_json))
+    if compiled is not None and compiled[0] is canvas_json:
+        slots = compiled[1]
+    else:
+        slots = _compile_template(canvas_json)
+
+    resolved = dict(canvas_json)
+    copied = {id(resolved)}
+    for path, text in slots:
+        node = resolved
+        for key in path[:-1]:
+            child = node[key]
+            if id(child) not in copied:
+                child = child.copy()
+                copied.add(id(child))
+                node[key] = child
+            node = child
+        node[path[-1]] = _PLACEHOLDER_RE.sub(replacer, text)
+    return resolved
 
 
 async def _render_via_service(
@@ -112,12 +196,37 @@ async def _render_via_service(
         return None
 
 
+async def _render_batch_via_service(items: list[dict]) -> dict[str, bytes]:
+    """
+    Render several Fabric.js canvases in one /render/batch request.
+    Returns {item id: PNG bytes} for the items that rendered; empty if the
+    renderer is unavailable.
+    """
+    try:
+        from app.services.v2.renderer_client import render_batch
+        results = await render_batch(items)
+    except Exception as e:
+        logger.warning(f"Renderer service unavailable, falling back to Pillow: {e}")
+        return {}
+
+    rendered = {}
+    for r in results:
+        if r.get("success") and r.get("image_base64"):
+            rendered[r["id"]] = base64.b64decode(r["image_base64"])
+        else:
+            logger.info(f"Batch render failed for {r.get('id')}: {r.get('error')}")
+    return rendered
+
+
 async def _load_template_from_db(
     ad_type_id: str,
     aspect_ratio: str,
 ) -> dict | None:
     """Load Fabric.js template JSON from AdTemplate table.
-    Falls back to parent type via TEMPLATE_FALLBACK_MAP if no template found."""
+    Falls back to parent type via TEMPLATE_FALLBACK_MAP if no template found.
+
+    The returned dict is shared across renders (see _cached_canvas) and must
+    not be mutated."""
     try:
         from prisma import Prisma
         db = Prisma()
@@ -131,7 +240,7 @@ async def _load_template_from_db(
                 order={"is_default": "desc"},
             )
             if template:
-                return template.canvas_json
+                return _cached_canvas(template)
 
             # Fallback to parent type's template
             fallback_id = TEMPLATE_FALLBACK_MAP.get(ad_type_id)
@@ -145,7 +254,7 @@ async def _load_template_from_db(
                     order={"is_default": "desc"},
                 )
                 if template:
-                    return template.canvas_json
+                    return _cached_canvas(template)
         finally:
             await db.disconnect()
     except Exception as e:
@@ -616,12 +725,34 @@ class StaticAdRenderer:
         params: CreativeParameters,
         hook_text: str | None = None,
     ) -> dict[str, bytes]:
-        """Render ad in all configured aspect ratios."""
+        """
+        Render ad in all configured aspect ratios.
+
+        Ratios that have a Fabric.js template go to the renderer in a single
+        batch request; the rest (or any that fail) use the Pillow fallback.
+        """
+        ratios = [r for r in ad_type.aspect_ratios if r in ASPECT_RATIO_SIZES]
+
+        items = []
+        for ratio in ratios:
+            template_json = await _load_template_from_db(ad_type.id, ratio)
+            if template_json:
+                w, h = ASPECT_RATIO_SIZES[ratio]
+                items.append({
+                    "id": ratio,
+                    "canvas_json": _resolve_template_variables(template_json, params, hook_text),
+                    "width": w,
+                    "height": h,
+                    "format": "png",
+                })
+        rendered = await _render_batch_via_service(items) if items else {}
+
         results = {}
-        for ratio in ad_type.aspect_ratios:
-            if ratio in ASPECT_RATIO_SIZES:
-                img_bytes = await self.render_ad(ad_type, params, ratio, hook_text)
-                results[ratio] = img_bytes
+        for ratio in ratios:
+            img_bytes = rendered.get(ratio)
+            if img_bytes is None:
+                img_bytes = await _pillow_render(ad_type, params, ratio, hook_text)
+            results[ratio] = img_bytes
         return results
 
 
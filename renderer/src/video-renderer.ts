@@ -2,14 +2,13 @@
  * Video Renderer — Remotion bundle + render logic.
  *
  * Pre-bundles the Remotion project on startup via webpack, then renders
- * individual compositions to MP4 on demand.
+ * individual compositions to MP4 on demand. All renders share one headless
+ * browser; within a render Remotion splits the frames across parallel tabs.
  */
 
 import path from "path";
-import fs from "fs/promises";
-import os from "os";
 import { bundle } from "@remotion/bundler";
-import { renderMedia, selectComposition } from "@remotion/renderer";
+import { openBrowser, renderMedia, selectComposition } from "@remotion/renderer";
 
 const ALLOWED_COMPOSITIONS = new Set(["BrandedStatic", "ServiceHero"]);
 
@@ -23,9 +22,45 @@ const ENTRY_POINT = path.resolve(
   "index.ts",
 );
 
+// Frames rendered in parallel per video (tabs in the shared browser).
+// Unset = Remotion's default of half the CPU cores.
+const RENDER_CONCURRENCY = process.env.REMOTION_CONCURRENCY
+  ? Number(process.env.REMOTION_CONCURRENCY)
+  : null;
+
 let bundlePath: string | null = null;
 let bundlePromise: Promise<string> | null = null;
 
+type RemotionBrowser = Awaited<ReturnType<typeof openBrowser>>;
+let browserPromise: Promise<RemotionBrowser> | null = null;
+let activeRenders = 0;
+
+/**
+ * Shared browser for selectComposition/renderMedia, so each video render
+ * doesn't launch and tear down its own Chromium.
+ */
+function getBrowser(): Promise<RemotionBrowser> {
+  if (!browserPromise) {
+    browserPromise = openBrowser("chrome").catch((err) => {
+      browserPromise = null;
+      throw err;
+    });
+  }
+  return browserPromise;
+}
+
+async function resetBrowser(): Promise<void> {
+  const pending = browserPromise;
+  browserPromise = null;
+  if (pending) {
+    try {
+      await (await pending).close({ silent: true });
+    } catch {
+      // already gone
+    }
+  }
+}
+
 /**
  * Pre-bundle Remotion project via webpack. Call once on startup.
  * Subsequent calls return cached bundle path.
@@ -79,43 +114,53 @@ export async function renderVideo({
     await warmupBundle();
   }
 
-  const outputPath = path.join(
-    os.tmpdir(),
-    `remotion-${compositionId}-${Date.now()}.mp4`,
-  );
-
+  const puppeteerInstance = await getBrowser();
+  activeRenders++;
+  let failed = false;
+  const start = Date.now();
+  let buffer: Buffer | null;
   try {
     const composition = await selectComposition({
       serveUrl: bundlePath!,
       id: compositionId,
       inputProps,
+      puppeteerInstance,
     });
 
     console.log(
       `[video-renderer] Rendering ${compositionId} (${composition.durationInFrames} frames @ ${composition.fps}fps)`,
     );
-    const start = Date.now();
 
-    await renderMedia({
+    // No outputLocation: Remotion hands back the MP4 in memory, so there is
+    // no temp file to write, read back and unlink.
+    ({ buffer } = await renderMedia({
       composition,
       serveUrl: bundlePath!,
       codec,
-      outputLocation: outputPath,
+      outputLocation: null,
       inputProps,
-    });
-
-    const videoBytes = await fs.readFile(outputPath);
-    console.log(
-      `[video-renderer] Render complete: ${compositionId} (${videoBytes.length} bytes, ${Date.now() - start}ms)`,
-    );
-
-    return Buffer.from(videoBytes);
+      puppeteerInstance,
+      concurrency: RENDER_CONCURRENCY,
+    }));
+  } catch (err) {
+    failed = true;
+    throw err;
   } finally {
-    // Cleanup temp file
-    try {
-      await fs.unlink(outputPath);
-    } catch {
-      // ignore cleanup errors
+    activeRenders--;
+    // The failure may have been a browser crash, which would fail every
+    // later render. Relaunch next time — but never under a render in flight.
+    if (failed && activeRenders === 0) {
+      await resetBrowser();
     }
   }
+
+  if (!buffer) {
+    throw new Error(`Remotion returned no video buffer for ${compositionId}`);
+  }
+
+  console.log(
+    `[video-renderer] Render complete: ${compositionId} (${buffer.length} bytes, ${Date.now() - start}ms)`,
+  );
+
+  return buffer;
 }
@@ -7,6 +7,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from app.services.v2.browser_pool import closing
 from app.services.v2.social_templates.tweet import TweetParams, render_tweet
 from app.services.v2.social_templates.tiktok_comment import TikTokCommentParams, render_tiktok_comment
 from app.services.v2.social_templates.instagram_story import InstagramStoryParams, render_instagram_story
@@ -130,4 +131,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(closing(main()))
@@ -13,6 +13,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from app.services.v2.browser_pool import closing
 from app.services.v2.social_templates.reddit_post import RedditPostParams, render_reddit_post
 from app.services.v2.social_templates.blog_review import BlogReviewParams, render_blog_review
 from app.services.v2.copy_generator import generate_competition_copy
@@ -125,4 +126,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(closing(main()))
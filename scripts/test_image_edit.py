@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
+from app.services.v2.browser_pool import closing
 from app.services.v2.image_editor import edit_image_from_file
 from app.services.v2.social_templates.product_showcase import (
     ProductShowcaseParams,
@@ -58,4 +59,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(closing(main()))
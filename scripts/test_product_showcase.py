@@ -6,6 +6,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from app.services.v2.browser_pool import closing
 from app.services.v2.social_templates.product_showcase import (
     ProductShowcaseParams,
     render_product_showcase,
@@ -38,4 +39,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(closing(main()))
@@ -6,6 +6,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from app.services.v2.browser_pool import closing
 from app.services.v2.social_templates.service_hero import (
     ServiceHeroParams,
     render_service_hero,
@@ -50,4 +51,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(closing(main()))
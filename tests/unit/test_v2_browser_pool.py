@@ -0,0 +1,298 @@
+"""Tests for the shared Chromium pool — page lifecycle and browser recycling."""
+
+import asyncio
+import base64
+
+import pytest
+
+from app.services.v2 import browser_pool
+
+
+class FakeCDPSession:
+    def __init__(self, page):
+        self.page = page
+        self.detached = False
+
+    async def send(self, method, params):
+        assert method == "Page.captureScreenshot"
+        self.page.captures.append(params)
+        await asyncio.sleep(0.01)
+        return {"data": base64.b64encode(b"PNG").decode()}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.captures = []
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, **kwargs):
+        self.options = kwargs
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page):
+        return FakeCDPSession(page)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, **kwargs):
+        ctx = FakeContext(**kwargs)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def launches(monkeypatch):
+    """Replace the Chromium launch with FakeBrowser instances."""
+    launched = []
+
+    async def fake_get_browser():
+        browser_pool._bind_loop()
+        if browser_pool._browser is None:
+            browser_pool._browser = FakeBrowser()
+            launched.append(browser_pool._browser)
+        return browser_pool._browser
+
+    monkeypatch.setattr(browser_pool, "_loop", None)
+    monkeypatch.setattr(browser_pool, "_browser", None)
+    monkeypatch.setattr(browser_pool, "get_browser", fake_get_browser)
+    return launched
+
+
+class FakeChromium:
+    def __init__(self):
+        self.calls = []
+
+    async def launch(self, **kwargs):
+        self.calls.append(("launch", kwargs))
+        return FakeBrowser()
+
+    async def connect(self, ws_endpoint):
+        self.calls.append(("connect", ws_endpoint))
+        return FakeBrowser()
+
+
+@pytest.fixture
+def chromium(monkeypatch):
+    """Stand in for Playwright itself, recording how the browser is obtained."""
+    fake = FakeChromium()
+
+    class FakePlaywright:
+        chromium = fake
+
+    class Starter:
+        async def start(self):
+            return FakePlaywright()
+
+    monkeypatch.setattr(browser_pool, "_loop", None)
+    monkeypatch.setattr(browser_pool, "_browser", None)
+    monkeypatch.setattr(browser_pool, "_playwright", None)
+    monkeypatch.setattr(browser_pool, "async_playwright", Starter)
+    return fake
+
+
+class TestGetBrowser:
+    async def test_launches_locally_by_default(self, chromium, monkeypatch):
+        monkeypatch.setattr(browser_pool, "PLAYWRIGHT_REMOTE_WS", None)
+        browser = await browser_pool.get_browser()
+        assert await browser_pool.get_browser() is browser
+        assert chromium.calls == [("launch", {"headless": True, "args": browser_pool.CHROMIUM_ARGS})]
+
+    async def test_connects_to_remote_endpoint(self, chromium, monkeypatch):
+        monkeypatch.setattr(browser_pool, "PLAYWRIGHT_REMOTE_WS", "ws://browserless:3000/playwright")
+        await browser_pool.get_browser()
+        assert chromium.calls == [("connect", "ws://browserless:3000/playwright")]
+
+
+class TestAcquirePage:
+    async def test_page_closed_after_use(self, launches):
+        async with browser_pool.acquire_page() as page:
+            assert not page.closed
+        assert page.closed
+
+    async def test_context_reused_per_viewport(self, launches):
+        for _ in range(2):
+            async with browser_pool.acquire_page():
+                pass
+        async with browser_pool.acquire_page(width=1080, height=1920):
+            pass
+        contexts = launches[0].contexts
+        assert len(contexts) == 2
+        assert len(contexts[0].pages) == 2
+        assert contexts[1].options["viewport"] == {"width": 1080, "height": 1920}
+
+    async def test_default_scale_factor(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "DEVICE_SCALE_FACTOR", 1)
+        async with browser_pool.acquire_page():
+            pass
+        async with browser_pool.acquire_page(device_scale_factor=2):
+            pass
+        scales = [c.options["device_scale_factor"] for c in launches[0].contexts]
+        assert scales == [1, 2]
+
+    async def test_recycles_after_quota(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "BROWSER_RECYCLE_AFTER", 2)
+        for _ in range(3):
+            async with browser_pool.acquire_page():
+                pass
+        assert len(launches) == 2
+        assert launches[0].closed
+        assert not launches[1].closed
+        assert len(launches[1].contexts) == 1
+
+    async def test_no_recycle_while_pages_open(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "BROWSER_RECYCLE_AFTER", 1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with browser_pool.acquire_page():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        async with browser_pool.acquire_page():
+            pass
+        assert not launches[0].closed
+
+        release.set()
+        await holder
+        assert launches[0].closed
+
+    async def test_recycling_disabled(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "BROWSER_RECYCLE_AFTER", 0)
+        for _ in range(3):
+            async with browser_pool.acquire_page():
+                pass
+        assert len(launches) == 1
+
+
+class TestWarmUp:
+    async def test_opens_default_context(self, launches, monkeypatch):
+        assert browser_pool.browser_status() == "idle"
+        await browser_pool.warm_up()
+        assert browser_pool.browser_status() == "connected"
+        assert launches[0].contexts[0].options["viewport"] == {"width": 1080, "height": 1080}
+
+        async with browser_pool.acquire_page():
+            pass
+        assert len(launches[0].contexts) == 1
+
+
+class TestScreenshot:
+    async def test_captures_viewport_over_cdp(self, launches):
+        async with browser_pool.acquire_page() as page:
+            assert await browser_pool.screenshot(page) == b"PNG"
+            assert await browser_pool.screenshot(page, fmt="jpeg", quality=80) == b"PNG"
+            assert await browser_pool.screenshot(page, fmt="webp", quality=75) == b"PNG"
+            assert await browser_pool.screenshot(page, quality=80) == b"PNG"
+        base = {"captureBeyondViewport": False, "fromSurface": True, "optimizeForSpeed": True}
+        assert page.captures == [
+            {"format": "png", **base},
+            {"format": "jpeg", **base, "quality": 80},
+            {"format": "webp", **base, "quality": 75},
+            {"format": "png", **base},
+        ]
+
+    async def test_concurrent_captures_capped(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "MAX_CONCURRENT_SCREENSHOTS", 2)
+        in_flight = peak = 0
+        original = FakeCDPSession.send
+
+        async def tracked(self, method, params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await original(self, method, params)
+            finally:
+                in_flight -= 1
+
+        monkeypatch.setattr(FakeCDPSession, "send", tracked)
+
+        async def shoot():
+            async with browser_pool.acquire_page() as page:
+                return await browser_pool.screenshot(page)
+
+        results = await asyncio.gather(*(shoot() for _ in range(6)))
+        assert results == [b"PNG"] * 6
+        assert peak == 2
+
+
+class TestWaitForFonts:
+    async def test_returns_when_fonts_ready(self):
+        class Page:
+            async def evaluate(self, js):
+                assert "document.fonts.ready" in js
+
+        await browser_pool.wait_for_fonts(Page())
+
+    async def test_gives_up_after_timeout(self):
+        class Page:
+            async def evaluate(self, js):
+                await asyncio.Event().wait()
+
+        await browser_pool.wait_for_fonts(Page(), timeout=0.01)
+
+
+class TestWaitForImages:
+    async def test_waits_on_image_decode(self):
+        class Page:
+            async def evaluate(self, js):
+                assert "decode()" in js
+
+        await browser_pool.wait_for_images(Page())
+
+    async def test_gives_up_after_timeout(self):
+        class Page:
+            async def evaluate(self, js):
+                await asyncio.Event().wait()
+
+        await browser_pool.wait_for_images(Page(), timeout=0.01)
+
+
+class TestClosing:
+    async def test_closes_browser_after_script(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "_playwright", None)
+
+        async def main():
+            async with browser_pool.acquire_page():
+                pass
+            return "done"
+
+        assert await browser_pool.closing(main()) == "done"
+        assert launches[0].closed
+        assert browser_pool.browser_status() == "idle"
+
+    async def test_closes_browser_on_error(self, launches, monkeypatch):
+        monkeypatch.setattr(browser_pool, "_playwright", None)
+
+        async def main():
+            async with browser_pool.acquire_page():
+                raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            await browser_pool.closing(main())
+        assert launches[0].closed
@@ -0,0 +1,53 @@
+"""Tests for the shared outbound HTTP client — cached image prefetch."""
+
+from collections import OrderedDict
+
+import httpx
+import pytest
+
+from app.services.v2 import http_client
+from app.services.v2.http_client import fetch_image
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Serve fetches from an in-process transport and record the URLs hit."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        if request.url.path == "/photo.png":
+            return httpx.Response(200, content=b"x" * 6, headers={"content-type": "image/png"})
+        if request.url.path == "/page.html":
+            return httpx.Response(200, content=b"<html>", headers={"content-type": "text/html"})
+        if request.url.path == "/moved.png":
+            return httpx.Response(302, headers={"location": "https://cdn.test/photo.png"})
+        return httpx.Response(404)
+
+    monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_image_cache", OrderedDict())
+    monkeypatch.setattr(http_client, "_image_cache_bytes", 0)
+    return seen
+
+
+class TestFetchImage:
+    async def test_fetches_once_per_url(self, requests):
+        assert await fetch_image("https://cdn.test/photo.png") == b"x" * 6
+        assert await fetch_image("https://cdn.test/photo.png") == b"x" * 6
+        assert requests == ["https://cdn.test/photo.png"]
+
+    @pytest.mark.parametrize("url", [
+        "https://cdn.test/page.html",
+        "https://cdn.test/missing.png",
+        "https://cdn.test/moved.png",
+        "file:///tmp/photo.png",
+        "data:image/png;base64,AAAA",
+    ])
+    async def test_unusable_responses_return_none(self, requests, url):
+        assert await fetch_image(url) is None
+
+    async def test_evicts_oldest_over_byte_budget(self, requests, monkeypatch):
+        monkeypatch.setattr(http_client, "IMAGE_CACHE_MAX_BYTES", 10)
+        await fetch_image("https://cdn.test/photo.png")
+        await fetch_image("https://cdn.test/photo.png?v=2")
+        assert list(http_client._image_cache) == ["https://cdn.test/photo.png?v=2"]
@@ -0,0 +1,157 @@
+"""Tests for v2 parameter extractor — direct extraction, LLM validation, merge."""
+
+import pytest
+
+from app.schemas.creative_params import BrandColors
+from app.services.v2.parameter_extractor import (
+    EXTRACTION_PROMPT,
+    _LLM_VALIDATOR,
+    _brand_from_url,
+    _build_prompt,
+    _extract_direct_params,
+    _merge_params,
+)
+
+
+@pytest.fixture
+def llm_output():
+    return {
+        "product_name": "CloudRest",
+        "business_type": "ecommerce",
+        "product_category": "pillows",
+        "key_benefit": "Eliminates neck pain",
+        "value_props": ["Cooling gel", "5-year warranty"],
+        "customer_pains": ["Neck pain", "Pillow goes flat"],
+        "customer_desires": ["Deep sleep"],
+        "tone": "premium",
+        "persona_primary": {
+            "label": "Side sleepers, 35-55",
+            "demographics": {"age_min": 35, "age_max": 55, "gender_skew": "female"},
+            "scenes": ["Woman waking up refreshed"],
+        },
+        "persona_secondary": {"label": None},
+        "language": "en",
+        "target_countries": ["GB"],
+    }
+
+
+class TestBuildPrompt:
+    def test_matches_str_format(self):
+        fields = dict(
+            scraped_text="Best pillow ever",
+            background_colors=["#FFFFFF"],
+            text_colors=["#111111"],
+            accent_colors=[],
+            fonts=["Inter"],
+            og_image="",
+            html_lang="en",
+            source_url="https://cloudrest.com",
+        )
+        assert _build_prompt(**fields) == EXTRACTION_PROMPT.format(**fields)
+
+
+class TestBrandFromUrl:
+    @pytest.mark.parametrize("url,expected", [
+        ("https://www.cloudrest.com/pillow", "Cloudrest"),
+        ("http://slack.com", "Slack"),
+        ("https://app.linear.app/team", "App"),
+        ("cloudrest.com", ""),
+    ])
+    def test_brand_from_url(self, url, expected):
+        assert _brand_from_url(url) == expected
+
+    def test_direct_params_without_url(self):
+        direct = _extract_direct_params({"headers": ["Sleep better"]}, None)
+        assert direct["brand_name"] == ""
+        assert direct["headline"] == "Sleep better"
+
+
+class TestLLMValidator:
+    def test_valid_output(self, llm_output):
+        assert next(_LLM_VALIDATOR.iter_errors(llm_output), None) is None
+
+    @pytest.mark.parametrize("override", [
+        {"product_name": "X"},
+        {"customer_pains": []},
+        {"business_type": "b2b"},
+        {"tone": "angry"},
+        {"value_props": "Cooling gel"},
+    ])
+    def test_rejects_malformed_output(self, llm_output, override):
+        assert next(_LLM_VALIDATOR.iter_errors({**llm_output, **override}), None) is not None
+
+    @pytest.mark.parametrize("persona", [
+        {"label": "Sleepers", "demographics": None, "language_style": None},
+        {"label": "Sleepers", "demographics": {"gender_skew": "all"}},
+        "Side sleepers",
+    ])
+    def test_persona_problems_are_not_fatal(self, llm_output, persona):
+        data = {**llm_output, "persona_primary": persona}
+        assert next(_LLM_VALIDATOR.iter_errors(data), None) is None
+
+    def test_rejects_non_object(self):
+        assert next(_LLM_VALIDATOR.iter_errors(["CloudRest"]), None) is not None
+
+
+class TestMergeParams:
+    def test_defaults_fill_missing_fields(self):
+        params = _merge_params({}, {"product_name": "CloudRest", "customer_pains": ["Neck pain"]})
+        assert params.product_name == "CloudRest"
+        assert params.business_type == "ecommerce"
+        assert params.product_category == "General"
+        assert params.cta_text == "Shop Now"
+        assert params.tone == "casual"
+        assert params.headline == "CloudRest"
+        assert params.language == "en"
+        assert params.target_countries == ["US"]
+        assert params.persona_primary is None
+
+    def test_direct_overrides_llm(self, llm_output):
+        direct = {
+            "source_url": "https://cloudrest.com",
+            "destination_url": "https://cloudrest.com",
+            "brand_name": "Cloudrest",
+            "brand_colors": BrandColors(primary="#2D5A7B"),
+            "headline": "Sleep better tonight",
+            "html_lang": "de",
+        }
+        params = _merge_params(direct, {**llm_output, "language": None})
+        assert params.brand_name == "Cloudrest"
+        assert params.brand_colors.primary == "#2D5A7B"
+        assert params.headline == "Sleep better tonight"
+        assert params.language == "de"
+        assert params.target_countries == ["GB"]
+
+    def test_personas(self, llm_output):
+        params = _merge_params({}, llm_output)
+        persona = params.persona_primary
+        assert persona.label == "Side sleepers, 35-55"
+        assert persona.demographics.gender_skew == "female"
+        assert persona.language_style == "Conversational"
+        assert params.persona_secondary is None
+
+    def test_invalid_persona_is_dropped(self, llm_output):
+        llm_output["persona_primary"]["demographics"]["age_min"] = "young"
+        params = _merge_params({}, llm_output)
+        assert params.persona_primary is None
+
+    def test_null_persona_fields_use_defaults(self, llm_output):
+        llm_output["persona_primary"] = {
+            "label": "Sleepers",
+            "demographics": None,
+            "language_style": None,
+            "scenes": None,
+        }
+        persona = _merge_params({}, llm_output).persona_primary
+        assert persona.demographics.gender_skew == "neutral"
+        assert persona.language_style == "Conversational"
+        assert persona.scenes == []
+
+    @pytest.mark.parametrize("persona", [
+        "Side sleepers",
+        {"label": "Sleepers", "demographics": {"gender_skew": "all"}},
+    ])
+    def test_malformed_personas_are_dropped(self, llm_output, persona):
+        params = _merge_params({}, {**llm_output, "persona_secondary": persona})
+        assert params.persona_secondary is None
+        assert params.persona_primary is not None
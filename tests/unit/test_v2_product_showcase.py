@@ -0,0 +1,56 @@
+"""Tests for the product showcase template — Pillow fast path."""
+
+import io
+
+from PIL import Image
+
+from app.services.v2.social_templates import product_showcase
+from app.services.v2.social_templates.product_showcase import (
+    ProductShowcaseParams,
+    _fit_square,
+    render_product_showcase,
+)
+
+
+def _png(size, color, mode="RGB"):
+    buf = io.BytesIO()
+    Image.new(mode, size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _open(data):
+    return Image.open(io.BytesIO(data))
+
+
+class TestFitSquare:
+    def test_center_crops_landscape(self):
+        # Left third red, middle third green, right third blue
+        img = Image.new("RGB", (300, 100), "green")
+        img.paste("red", (0, 0, 100, 100))
+        img.paste("blue", (200, 0, 300, 100))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+
+        out = _open(_fit_square(buf.getvalue(), 50))
+        assert out.size == (50, 50)
+        assert out.getpixel((25, 25)) == (0, 128, 0)
+
+    def test_transparency_becomes_white(self):
+        out = _open(_fit_square(_png((80, 80), (0, 0, 0, 0), mode="RGBA"), 40))
+        assert out.mode == "RGB"
+        assert out.getpixel((20, 20)) == (255, 255, 255)
+
+
+class TestRenderProductShowcase:
+    async def test_no_overlay_skips_chromium(self, monkeypatch):
+        def no_browser(*args, **kwargs):
+            raise AssertionError("Chromium should not be used")
+
+        monkeypatch.setattr(product_showcase, "acquire_page", no_browser)
+        png = await render_product_showcase(
+            ProductShowcaseParams(product_image_bytes=_png((120, 90), "red"))
+        )
+        out = _open(png)
+        side = 1080 * product_showcase.DEVICE_SCALE_FACTOR
+        assert out.size == (side, side)
+        assert out.getpixel((side // 2, side // 2)) == (255, 0, 0)
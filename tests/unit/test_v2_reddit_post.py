@@ -0,0 +1,20 @@
+"""Tests for the Reddit post template — count formatting."""
+
+import pytest
+
+from app.services.v2.social_templates.reddit_post import _format_count
+
+
+class TestFormatCount:
+    @pytest.mark.parametrize("n,expected", [
+        (0, "0"),
+        (999, "999"),
+        (1_000, "1.0k"),
+        (1_234, "1.2k"),
+        (10_000, "10.0k"),
+        (99_999, "100.0k"),
+        (100_000, "100k"),
+        (1_234_567, "1235k"),
+    ])
+    def test_format_count(self, n, expected):
+        assert _format_count(n) == expected
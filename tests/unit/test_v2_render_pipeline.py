@@ -0,0 +1,174 @@
+"""Tests for v2 render pipeline — render memoization, targeting, manual images."""
+
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from app.schemas.creative_params import CreativeParameters, PersonaDemographics, TargetPersona
+from app.services.v2 import render_pipeline
+from app.services.v2.render_pipeline import (
+    _image_size,
+    _memoized_render,
+    _render_key,
+    _template_key,
+    build_targeting,
+    dispatch_render,
+)
+from app.services.v2.social_templates.blog_review import BlogReviewParams
+
+
+@pytest.fixture(autouse=True)
+def empty_memo(monkeypatch):
+    monkeypatch.setattr(render_pipeline, "_render_memo", render_pipeline.OrderedDict())
+    monkeypatch.setattr(render_pipeline, "_render_memo_bytes", 0)
+    monkeypatch.setattr(render_pipeline, "_render_inflight", {})
+
+
+@pytest.fixture
+def params():
+    return CreativeParameters(product_name="CloudRest", customer_pains=["Neck pain"])
+
+
+class TestRenderKey:
+    def test_stable_across_dict_order(self, params):
+        a = _render_key("review_static", params, {"headline": "H", "cta_type": "SHOP_NOW"}, {})
+        b = _render_key("review_static", params, {"cta_type": "SHOP_NOW", "headline": "H"}, {})
+        assert a == b
+
+    def test_differs_on_inputs(self, params):
+        base = _render_key("review_static", params, {"headline": "H"}, {})
+        assert base != _render_key("service_hero", params, {"headline": "H"}, {})
+        assert base != _render_key("review_static", params, {"headline": "I"}, {})
+        other = params.model_copy(update={"product_name": "SleepWell"})
+        assert base != _render_key("review_static", other, {"headline": "H"}, {})
+
+
+class TestTemplateKey:
+    def test_keyed_on_params_values(self):
+        a = _template_key("blog_review", BlogReviewParams(body="Great", claps=200))
+        assert a == _template_key("blog_review", BlogReviewParams(body="Great", claps=200))
+        assert a != _template_key("blog_review", BlogReviewParams(body="Great", claps=201))
+        assert a != _template_key("instagram_story", BlogReviewParams(body="Great", claps=200))
+
+
+class TestMemoizedRender:
+    async def test_concurrent_calls_share_one_render(self):
+        calls = 0
+
+        async def render():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return b"PNG"
+
+        results = await asyncio.gather(*(_memoized_render("k", render) for _ in range(3)))
+        assert results == [b"PNG"] * 3
+        assert await _memoized_render("k", render) == b"PNG"
+        assert calls == 1
+
+    async def test_failures_are_not_cached(self):
+        async def fail():
+            raise RuntimeError("browser crashed")
+
+        async def render():
+            return b"PNG"
+
+        with pytest.raises(RuntimeError):
+            await _memoized_render("k", fail)
+        assert await _memoized_render("k", render) == b"PNG"
+
+    async def test_force_rerenders_and_replaces_entry(self):
+        renders = iter([b"old", b"new!"])
+
+        async def render():
+            return next(renders)
+
+        assert await _memoized_render("k", render) == b"old"
+        assert await _memoized_render("k", render, force=True) == b"new!"
+        assert render_pipeline._render_memo["k"][0] == b"new!"
+        assert render_pipeline._render_memo_bytes == 4
+
+    async def test_superseded_render_does_not_overwrite(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return b"stale"
+
+        async def fresh():
+            return b"fresh"
+
+        stale = asyncio.create_task(_memoized_render("k", slow))
+        await asyncio.sleep(0)
+        assert await _memoized_render("k", fresh, force=True) == b"fresh"
+        release.set()
+        assert await stale == b"stale"
+        assert render_pipeline._render_memo["k"][0] == b"fresh"
+
+    async def test_evicts_oldest_over_byte_budget(self, monkeypatch):
+        monkeypatch.setattr(render_pipeline, "RENDER_MEMO_MAX_BYTES", 10)
+
+        async def render():
+            return b"x" * 6
+
+        await _memoized_render("a", render)
+        await _memoized_render("b", render)
+        assert list(render_pipeline._render_memo) == ["b"]
+
+
+class TestDispatchRender:
+    async def test_mock_values_seeded_from_inputs(self, params, monkeypatch):
+        seen = []
+
+        async def render(reddit_params):
+            seen.append(reddit_params)
+            return b"PNG"
+
+        bridge = render_pipeline._STATIC_RENDERERS["organic_static_reddit"][1]
+        monkeypatch.setitem(
+            render_pipeline._STATIC_RENDERERS, "organic_static_reddit", (render, bridge)
+        )
+        copy = {"primary_text": "Finally slept through the night"}
+        for force in (False, True):
+            await dispatch_render("organic_static_reddit", params, copy, {}, force=force)
+        await dispatch_render("organic_static_reddit", params, {"primary_text": "Other"}, {})
+
+        assert seen[0] == seen[1]
+        assert (seen[0].username, seen[0].upvotes) != (seen[2].username, seen[2].upvotes)
+
+
+class TestBuildTargeting:
+    @pytest.mark.parametrize("skew,genders", [
+        ("neutral", None),
+        ("male", [1]),
+        ("female", [2]),
+    ])
+    def test_gender_skew(self, params, skew, genders):
+        persona = TargetPersona(label="Sleepers", demographics=PersonaDemographics(gender_skew=skew))
+        spec = build_targeting(params.model_copy(update={"persona_primary": persona}))
+        assert spec.genders == genders
+
+    def test_unknown_skew_targets_all(self, params):
+        demo = PersonaDemographics.model_construct(age_min=25, age_max=54, gender_skew="other")
+        persona = TargetPersona.model_construct(label="Sleepers", demographics=demo)
+        spec = build_targeting(params.model_copy(update={"persona_primary": persona}))
+        assert spec.genders is None
+
+    def test_no_persona(self, params):
+        spec = build_targeting(params)
+        assert spec.genders is None
+        assert spec.geo_locations == {"countries": ["US"]}
+
+
+class TestManualImageCreative:
+    @staticmethod
+    def _png(w, h):
+        buf = io.BytesIO()
+        Image.new("RGB", (w, h), "white").save(buf, format="PNG")
+        return buf.getvalue()
+
+    def test_image_size(self):
+        assert _image_size(self._png(1200, 800)) == (1200, 800)
+        assert _image_size(b"not an image") == (0, 0)
@@ -0,0 +1,32 @@
+"""Tests for v2 seed template generation and loading."""
+
+import pytest
+
+from app.services.v2.seed_templates.generate import (
+    AD_TYPE_BUILDERS,
+    ASPECT_RATIOS,
+    SIZES,
+    load_template,
+    template_path,
+)
+
+
+class TestTemplatePath:
+    @pytest.mark.parametrize("ratio,filename", [
+        ("1:1", "review_static_1x1.json"),
+        ("9:16", "review_static_9x16.json"),
+        ("1.91:1", "review_static_1_91x1.json"),
+    ])
+    def test_ratio_slug(self, ratio, filename):
+        assert template_path("review_static", ratio).name == filename
+
+
+class TestLoadTemplate:
+    @pytest.mark.parametrize("ad_type_id", list(AD_TYPE_BUILDERS))
+    def test_checked_in_json_matches_builders(self, ad_type_id):
+        builder = AD_TYPE_BUILDERS[ad_type_id]
+        for ratio in ASPECT_RATIOS:
+            assert load_template(ad_type_id, ratio) == builder(*SIZES[ratio])
+
+    def test_parsed_once(self):
+        assert load_template("review_static", "1:1") is load_template("review_static", "1:1")
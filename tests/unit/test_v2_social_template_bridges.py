@@ -0,0 +1,38 @@
+"""Tests for v2 social template bridges — color derivation."""
+
+import pytest
+
+from app.services.v2.social_template_bridges import _derive_palette, _is_light
+
+
+class TestIsLight:
+    @pytest.mark.parametrize("color,expected", [
+        ("#ffffff", True),
+        ("#FFFFFF", True),
+        ("#e2e8f0", True),
+        ("#C0C0C0", True),
+        ("#bbbbbb", False),
+        ("#0f172a", False),
+        ("rgb(255, 255, 255)", False),
+        ("", False),
+    ])
+    def test_is_light(self, color, expected):
+        assert _is_light(color) is expected
+
+
+class TestDerivePalette:
+    def test_defaults(self):
+        assert _derive_palette({}) == ("#0f172a", "#3b82f6", "#ffffff", None)
+
+    def test_light_background_uses_scraped_text_color(self):
+        scraped = {
+            "styling": {"backgrounds": ["#FAFAFA"], "accents": ["#E11D48"], "text": ["#111827"]},
+            "design_tokens": {"gradients": [{"raw": "linear-gradient(#fff, #eee)"}]},
+        }
+        assert _derive_palette(scraped) == (
+            "#FAFAFA", "#E11D48", "#111827", "linear-gradient(#fff, #eee)",
+        )
+
+    def test_light_background_without_text_colors(self):
+        scraped = {"styling": {"backgrounds": ["#ffffff"]}, "design_tokens": {"gradients": []}}
+        assert _derive_palette(scraped)[2] == "#1a202c"
@@ -1,6 +1,7 @@
 """Tests for v2 static renderer — Pillow-based image generation."""
 
 import io
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -8,10 +9,13 @@ from PIL import Image, ImageDraw
 
 from app.schemas.creative_params import CreativeParameters, BrandColors
 from app.schemas.ad_types import AdTypeDefinition, LayerDefinition, CopyTemplate
+from app.services.v2 import static_renderer
 from app.services.v2.static_renderer import (
     StaticAdRenderer,
     ASPECT_RATIO_SIZES,
     _resolve_var,
+    _resolve_template_variables,
+    _cached_canvas,
     _check_condition,
     _wrap_text,
     _load_font,
@@ -90,6 +94,69 @@ class TestResolveVar:
         assert _resolve_var("plain text", full_params) == "plain text"
 
 
+class TestResolveTemplateVariables:
+    @pytest.fixture
+    def template(self):
+        return {
+            "background": "{{brand_colors.primary}}",
+            "objects": [
+                {"type": "rect", "fill": "#FFFFFF"},
+                {"type": "textbox", "text": "With {{product_name}}: {{value_props[1]}}"},
+                {"type": "textbox", "text": "{{problem_hook}} {{customer_pains[9]}}"},
+            ],
+        }
+
+    def test_substitutes_placeholders(self, full_params, template):
+        out = _resolve_template_variables(template, full_params)
+        assert out["background"] == full_params.brand_colors.primary
+        assert out["objects"][1]["text"] == "With CloudRest Pillow: 5-year warranty"
+        assert out["objects"][2]["text"] == " "
+
+    def test_hook_override(self, full_params, template):
+        out = _resolve_template_variables(template, full_params, hook_text="Tired?")
+        assert out["objects"][2]["text"] == "Tired? "
+
+    def test_quotes_and_newlines_survive(self, full_params, template):
+        full_params.product_name = 'The "Best"\\Pillow\n'
+        out = _resolve_template_variables(template, full_params)
+        assert out["objects"][1]["text"] == 'With The "Best"\\Pillow\n: 5-year warranty'
+
+    def test_input_not_mutated(self, full_params, template):
+        _resolve_template_variables(template, full_params)
+        assert template["objects"][1]["text"] == "With {{product_name}}: {{value_props[1]}}"
+
+
+class TestCachedCanvas:
+    @pytest.fixture(autouse=True)
+    def empty_caches(self, monkeypatch):
+        monkeypatch.setattr(static_renderer, "_db_canvases", {})
+        monkeypatch.setattr(static_renderer, "_compiled_slots", {})
+
+    @staticmethod
+    def _row(updated_at, text="{{product_name}}"):
+        return SimpleNamespace(id="t1", updated_at=updated_at, canvas_json={"text": text})
+
+    def test_unchanged_row_reuses_compiled_slots(self, full_params, monkeypatch):
+        canvas = _cached_canvas(self._row(1))
+        assert _cached_canvas(self._row(1)) is canvas
+
+        def no_compile(canvas_json):
+            raise AssertionError("template compiled again")
+
+        monkeypatch.setattr(static_renderer, "_compile_template", no_compile)
+        out = _resolve_template_variables(canvas, full_params)
+        assert out["text"] == full_params.product_name
+
+    def test_updated_row_is_recompiled(self, full_params):
+        old = _cached_canvas(self._row(1))
+        new = _cached_canvas(self._row(2, text="Buy {{product_name}}"))
+        assert new is not old
+        assert list(static_renderer._compiled_slots) == [id(new)]
+        assert _resolve_template_variables(new, full_params)["text"] == (
+            f"Buy {full_params.product_name}"
+        )
+
+
 class TestCheckCondition:
     def test_no_condition(self, full_params):
         assert _check_condition(None, full_params) is True
@@ -351,6 +418,32 @@ class TestStaticAdRenderer:
         assert "9:16" in results
         assert len(results) == 2
 
+    @pytest.mark.asyncio
+    async def test_render_all_ratios_batches_templates(self, renderer, simple_static_type, full_params):
+        """Templated ratios go to the renderer in one batch; others use Pillow."""
+        import base64
+
+        png = io.BytesIO()
+        Image.new("RGB", (10, 10), "red").save(png, format="PNG")
+        template = {"objects": [{"type": "textbox", "text": "{{product_name}}"}]}
+
+        async def load_template(ad_type_id, ratio):
+            return template if ratio == "1:1" else None
+
+        render_batch = AsyncMock(return_value=[
+            {"id": "1:1", "success": True, "image_base64": base64.b64encode(png.getvalue()).decode()},
+        ])
+        with patch("app.services.v2.static_renderer._load_template_from_db", side_effect=load_template), \
+                patch("app.services.v2.renderer_client.render_batch", render_batch):
+            results = await renderer.render_all_ratios(simple_static_type, full_params)
+
+        render_batch.assert_awaited_once()
+        (items,), _ = render_batch.call_args
+        assert [i["id"] for i in items] == ["1:1"]
+        assert items[0]["canvas_json"]["objects"][0]["text"] == "CloudRest Pillow"
+        assert results["1:1"] == png.getvalue()
+        assert Image.open(io.BytesIO(results["9:16"])).size == (1080, 1920)
+
     @pytest.mark.asyncio
     async def test_render_with_hook_text(self, renderer, full_params):
         """Hook text substitution for problem/organic types."""